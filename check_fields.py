@@ -1,10 +1,7 @@
-import sqlite3
+from check_utils import column_names
 
 def check_field():
-    conn = sqlite3.connect("data/prospects.db")
-    cursor = conn.cursor()
-    cursor.execute("PRAGMA table_info(company)")
-    columns = [row[1] for row in cursor.fetchall()]
+    columns = column_names("company")
     if "fitness_level" in columns:
         print("YES, fitness_level exists")
     else:
@@ -14,7 +11,6 @@ def check_field():
         print("YES, fitness_score exists")
     else:
         print("NO, fitness_score MISSING")
-    conn.close()
 
 if __name__ == "__main__":
     check_field()
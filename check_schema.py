@@ -1,13 +1,8 @@
-import sqlite3
+import sys
+from check_utils import table_info
 
 def check_schema():
-    conn = sqlite3.connect("data/prospects.db")
-    cursor = conn.cursor()
-    cursor.execute("PRAGMA table_info(company)")
-    columns = cursor.fetchall()
-    for col in columns:
-        print(col)
-    conn.close()
+    sys.stdout.write("".join(f"{col}\n" for col in table_info("company")))
 
 if __name__ == "__main__":
     check_schema()
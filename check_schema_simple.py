@@ -1,12 +1,8 @@
-import sqlite3
+from check_utils import table_info
 
 def check_schema():
-    conn = sqlite3.connect("data/prospects.db")
-    cursor = conn.cursor()
-    cursor.execute("PRAGMA table_info(company)")
-    columns = [row[1] for row in cursor.fetchall()]
+    columns = [row[1] for row in table_info("company")]
     print(f"Columns: {', '.join(columns)}")
-    conn.close()
 
 if __name__ == "__main__":
     check_schema()
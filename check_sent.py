@@ -1,17 +1,14 @@
-from src.storage.db import get_session
+from src.storage.db import get_readonly_session
 from src.storage.models import Outreach
-from sqlmodel import select
+from sqlmodel import select, func
 
 def check_outreach_status():
-    with get_session() as session:
-        statement = select(Outreach)
-        results = session.exec(statement).all()
-        print(f"Total Outreach records: {len(results)}")
-        status_counts = {}
-        for r in results:
-            status_counts[r.status] = status_counts.get(r.status, 0) + 1
+    with get_readonly_session() as session:
+        statement = select(Outreach.status, func.count(Outreach.id)).group_by(Outreach.status)
+        status_counts = session.exec(statement).all()
+        print(f"Total Outreach records: {sum(count for _, count in status_counts)}")
         
-        for status, count in status_counts.items():
+        for status, count in status_counts:
             print(f"Status '{status}': {count}")
 
 if __name__ == "__main__":
@@ -1,19 +1,15 @@
-import sqlite3
+import sys
+from check_utils import get_connection
 
 def check_employee_count():
-    conn = sqlite3.connect("data/prospects.db")
-    cursor = conn.cursor()
+    cursor = get_connection().cursor()
     cursor.execute("SELECT domain, employee_count FROM company WHERE employee_count IS NOT NULL LIMIT 10")
-    rows = cursor.fetchall()
+    rows = [f"  {domain}: {employee_count}" for domain, employee_count in cursor.fetchall()]
     
     if rows:
-        print(f"Found {len(rows)} companies with employee_count:")
-        for row in rows:
-            print(f"  {row[0]}: {row[1]}")
+        sys.stdout.write("\n".join([f"Found {len(rows)} companies with employee_count:"] + rows) + "\n")
     else:
         print("No companies with employee_count found yet.")
-    
-    conn.close()
 
 if __name__ == "__main__":
     check_employee_count()
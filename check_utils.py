@@ -0,0 +1,18 @@
+import sqlite3
+from functools import lru_cache
+from typing import List, Set, Tuple
+
+from src.storage.db import DB_FILE, connect_sqlite
+
+@lru_cache(maxsize=1)
+def get_connection() -> sqlite3.Connection:
+    """Shared read-only connection for the check_* scripts, opened once per process."""
+    return connect_sqlite(DB_FILE, read_only=True)
+
+def table_info(table: str) -> List[Tuple]:
+    """Return the PRAGMA table_info rows for a table."""
+    return get_connection().execute(f"PRAGMA table_info({table})").fetchall()
+
+def column_names(table: str) -> Set[str]:
+    """Return the column names of a table."""
+    return {row[1] for row in table_info(table)}
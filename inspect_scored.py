@@ -1,14 +1,15 @@
-from src.storage.db import get_session
+import sys
+from src.storage.db import get_readonly_session
 from src.storage.models import Company
 from sqlmodel import select
 
 def inspect_companies():
-    with get_session() as session:
+    with get_readonly_session() as session:
         statement = select(Company).where(Company.is_scored == True).limit(20)
         companies = session.exec(statement).all()
-        print(f"Scored companies: {len(companies)}")
-        for c in companies:
-            print(f"{c.domain} | Score: {c.fitness_score} | Level: {c.fitness_level!r}")
+        lines = [f"Scored companies: {len(companies)}"]
+        lines += [f"{c.domain} | Score: {c.fitness_score} | Level: {c.fitness_level!r}" for c in companies]
+        sys.stdout.write("\n".join(lines) + "\n")
 
 if __name__ == "__main__":
     inspect_companies()
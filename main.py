@@ -1,5 +1,8 @@
 import json
-import time
+import os
+import signal
+import threading
+from functools import lru_cache
 from loguru import logger
 from src.storage.db import init_db, seed_signals
 from src.scheduler.manager import scheduler_manager
@@ -15,10 +18,17 @@ from src.scheduler.tasks import (
 from migrate_db import migrate_db
 
 
-def load_config():
-    with open("scoring_config.json", "r") as f:
+CONFIG_PATH = "scoring_config.json"
+
+@lru_cache(maxsize=1)
+def _read_config(path: str, mtime_ns: int):
+    with open(path, "r") as f:
         return json.load(f)
 
+def load_config():
+    """Return the parsed scoring config, re-reading it only when the file changes."""
+    return _read_config(CONFIG_PATH, os.stat(CONFIG_PATH).st_mtime_ns)
+
 def main():
     logger.add("logs/app.log", rotation="10 MB")
     logger.info("Starting Outbound Prospecting Agent v2.0 (Self-Sustaining Mode)...")
@@ -91,11 +101,16 @@ def main():
     except Exception as e:
         logger.warning(f"Initial health check failed (non-fatal): {e}")
 
+    # Block the main thread until SIGINT/SIGTERM instead of polling
+    stop_event = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop_event.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+
     try:
-        # Keep the main thread alive
-        while True:
-            time.sleep(1)
+        stop_event.wait()
     except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
         scheduler_manager.stop()
         logger.info("Agent stopped.")
 
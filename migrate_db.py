@@ -1,6 +1,39 @@
-import sqlite3
 import os
 from loguru import logger
+from src.storage.db import connect_sqlite
+
+# Columns added after the initial schema: (table, column, definition)
+COLUMN_MIGRATIONS = [
+    ("company", "agent_maturity_level", "TEXT"),
+    ("company", "signal_metadata", "TEXT"),
+    ("companysignallink", "intensity", "FLOAT DEFAULT 0.0"),
+    ("companysignallink", "occurrences", "INTEGER DEFAULT 0"),
+    ("contact", "relevance_score", "INTEGER DEFAULT 0"),
+    # NEW COLUMNS FOR OUTREACH SEQUENCING
+    ("contact", "outreach_stage", "INTEGER DEFAULT 0"),
+    ("contact", "last_outreach_sent_at", "TIMESTAMP"),
+    ("outreach", "stage", "INTEGER DEFAULT 1"),
+    ("company", "employee_count", "INTEGER"),
+    ("company", "last_scored_at", "TIMESTAMP"),
+]
+
+# Indexes on hot filter columns: (index, table, columns, partial-index WHERE or None).
+# Names match the indexes declared on the models so init_db() and this agree.
+INDEX_MIGRATIONS = [
+    ("ix_outreach_status", "outreach", "status", None),
+    ("ix_outreach_contact_id", "outreach", "contact_id", None),
+    ("ix_reply_contact_id", "reply", "contact_id", None),
+    ("ix_contact_company_id", "contact", "company_id", None),
+    ("ix_suppression_type_value", "suppressionlist", "type, value", None),
+    ("ix_contact_needs_email", "contact", "company_id", "email IS NULL"),
+    ("ix_company_high_fit", "company", "id", "fitness_level = 'high_fit'"),
+    ("ix_company_fitness_level", "company", "fitness_level", None),
+    ("ix_company_last_scored_at", "company", "last_scored_at", None),
+    ("ix_contact_outreach_status", "contact", "outreach_status", None),
+    ("ix_outreach_status_contact", "outreach", "status, contact_id", None),
+    ("ix_reply_classification_contact", "reply", "classification, contact_id", None),
+    ("ix_companysignallink_signal_company", "companysignallink", "signal_id, company_id", None),
+]
 
 def migrate_db():
     db_path = "data/prospects.db"
@@ -12,88 +45,68 @@ def migrate_db():
         logger.warning(f"Database {db_path} not found. init_db will create it with correct schema.")
         return
 
-    conn = sqlite3.connect(db_path)
+    conn = connect_sqlite(db_path)
+    # Manage the transaction explicitly: the whole migration is one BEGIN/COMMIT
+    conn.isolation_level = None
     cursor = conn.cursor()
 
-    # Add columns to company table
-    try:
-        cursor.execute("ALTER TABLE company ADD COLUMN agent_maturity_level TEXT")
-        logger.info("Added agent_maturity_level to company table")
-    except sqlite3.OperationalError:
-        logger.info("agent_maturity_level already exists in company table")
-
-    try:
-        cursor.execute("ALTER TABLE company ADD COLUMN signal_metadata TEXT")
-        logger.info("Added signal_metadata to company table")
-    except sqlite3.OperationalError:
-        logger.info("signal_metadata already exists in company table")
-
-    # Add columns to companysignallink table
-    try:
-        cursor.execute("ALTER TABLE companysignallink ADD COLUMN intensity FLOAT DEFAULT 0.0")
-        logger.info("Added intensity to companysignallink table")
-    except sqlite3.OperationalError:
-        logger.info("intensity already exists in companysignallink table")
-
-    try:
-        cursor.execute("ALTER TABLE companysignallink ADD COLUMN occurrences INTEGER DEFAULT 0")
-        logger.info("Added occurrences to companysignallink table")
-    except sqlite3.OperationalError:
-        logger.info("occurrences already exists in companysignallink table")
-
-    try:
-        cursor.execute("ALTER TABLE contact ADD COLUMN relevance_score INTEGER DEFAULT 0")
-        logger.info("Added relevance_score to contact table")
-    except sqlite3.OperationalError:
-        logger.info("relevance_score already exists in contact table")
-
-    # NEW COLUMNS FOR OUTREACH SEQUENCING
-    try:
-        cursor.execute("ALTER TABLE contact ADD COLUMN outreach_stage INTEGER DEFAULT 0")
-        logger.info("Added outreach_stage to contact table")
-    except sqlite3.OperationalError:
-        logger.info("outreach_stage already exists in contact table")
-
-    try:
-        cursor.execute("ALTER TABLE contact ADD COLUMN last_outreach_sent_at TIMESTAMP")
-        logger.info("Added last_outreach_sent_at to contact table")
-    except sqlite3.OperationalError:
-        logger.info("last_outreach_sent_at already exists in contact table")
-        
-    try:
-        cursor.execute("ALTER TABLE outreach ADD COLUMN stage INTEGER DEFAULT 1")
-        logger.info("Added stage to outreach table")
-    except sqlite3.OperationalError:
-        logger.info("stage already exists in outreach table")
+    # One PRAGMA table_info lookup per table instead of probing with ALTERs
+    existing = {
+        table: {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+        for table in {table for table, _, _ in COLUMN_MIGRATIONS}
+    }
 
-    try:
-        cursor.execute("ALTER TABLE company ADD COLUMN employee_count INTEGER")
-        logger.info("Added employee_count to company table")
-    except sqlite3.OperationalError:
-        logger.info("employee_count already exists in company table")
+    cursor.execute("BEGIN")
+    for table, column, definition in COLUMN_MIGRATIONS:
+        if column in existing[table]:
+            logger.info(f"{column} already exists in {table} table")
+            continue
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        logger.info(f"Added {column} to {table} table")
 
-    conn.commit()
+    # Back-fill last_scored_at from the timestamp previously kept only inside signal_metadata
+    # (stored in SQLAlchemy's "YYYY-MM-DD HH:MM:SS" form so it compares correctly)
+    cursor.execute("""
+        UPDATE company
+        SET last_scored_at = replace(json_extract(signal_metadata, '$.last_scored'), 'T', ' ')
+        WHERE last_scored_at IS NULL AND json_valid(signal_metadata)
+    """)
 
     # Create suppressionlist table if it doesn't exist
-    try:
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS suppressionlist (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                type TEXT NOT NULL,
-                value TEXT NOT NULL UNIQUE,
-                reason TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        cursor.execute("CREATE INDEX IF NOT EXISTS ix_suppressionlist_value ON suppressionlist (value)")
-        logger.info("Ensured suppressionlist table exists")
-    except sqlite3.OperationalError as e:
-        logger.info(f"suppressionlist table: {e}")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS suppressionlist (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            type TEXT NOT NULL,
+            value TEXT NOT NULL UNIQUE,
+            reason TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_suppressionlist_value ON suppressionlist (value)")
+    logger.info("Ensured suppressionlist table exists")
 
     # Create reply table if it doesn't exist
-    try:
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS reply (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            contact_id INTEGER NOT NULL REFERENCES contact(id),
+            content TEXT NOT NULL,
+            classification TEXT NOT NULL,
+            received_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            original_subject TEXT,
+            thread_id TEXT
+        )
+    """)
+    logger.info("Ensured reply table exists")
+
+    # Reply ids must never be reused (the outcome tracker counts replies past an id
+    # watermark); tables created by init_db lack AUTOINCREMENT, so rebuild them with it
+    reply_sql = cursor.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'reply'"
+    ).fetchone()[0]
+    if "AUTOINCREMENT" not in reply_sql.upper():
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS reply (
+            CREATE TABLE reply_new (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 contact_id INTEGER NOT NULL REFERENCES contact(id),
                 content TEXT NOT NULL,
@@ -103,11 +116,24 @@ def migrate_db():
                 thread_id TEXT
             )
         """)
-        logger.info("Ensured reply table exists")
-    except sqlite3.OperationalError as e:
-        logger.info(f"reply table: {e}")
+        cursor.execute("""
+            INSERT INTO reply_new (id, contact_id, content, classification, received_at, original_subject, thread_id)
+            SELECT id, contact_id, content, classification, received_at, original_subject, thread_id FROM reply
+        """)
+        cursor.execute("DROP TABLE reply")
+        cursor.execute("ALTER TABLE reply_new RENAME TO reply")
+        logger.info("Rebuilt reply table with AUTOINCREMENT ids")
+
+    # Indexes for the hot outreach/reply/contact/suppression filters
+    for index_name, table, columns, where in INDEX_MIGRATIONS:
+        partial = f" WHERE {where}" if where else ""
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({columns}){partial}")
+    logger.info("Ensured company/contact/outreach/reply/suppression indexes exist")
+
+    # Refresh planner statistics so the new indexes get picked up
+    cursor.execute("ANALYZE")
 
-    conn.commit()
+    cursor.execute("COMMIT")
     conn.close()
     logger.success("Database migration completed.")
 
@@ -1,15 +1,12 @@
 from src.storage.db import get_session
 from src.storage.models import Outreach
-from sqlmodel import select
+from sqlmodel import update
 
 def reset_failed():
     with get_session() as session:
-        statement = select(Outreach).where(Outreach.status == "failed")
-        results = session.exec(statement).all()
-        print(f"Resetting {len(results)} failed outreaches to 'draft'...")
-        for r in results:
-            r.status = "draft"
-            session.add(r)
+        statement = update(Outreach).where(Outreach.status == "failed").values(status="draft")
+        result = session.exec(statement)
+        print(f"Resetting {result.rowcount} failed outreaches to 'draft'...")
         session.commit()
 
 if __name__ == "__main__":
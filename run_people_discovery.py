@@ -1,19 +1,23 @@
 import asyncio
 from src.storage.db import get_session
 from src.storage.models import Company, Contact
-from sqlmodel import select
+from sqlmodel import select, update
 from src.enrichment.people_discovery import PeopleDiscoverer
 
 def setup_test_data():
     with get_session() as session:
-        # Find a company to test with
-        company = session.exec(select(Company).limit(1)).first()
-        if company:
-            print(f"Setting {company.domain} to high_fit for testing.")
-            company.fitness_level = "high_fit"
-            session.add(company)
-            session.commit()
-            return company.domain
+        # Promote a company to high_fit for testing, in one UPDATE ... RETURNING
+        statement = (
+            update(Company)
+            .where(Company.id.in_(select(Company.id).limit(1)))
+            .values(fitness_level="high_fit")
+            .returning(Company.domain)
+        )
+        domain = session.exec(statement).scalar_one_or_none()
+        session.commit()
+        if domain:
+            print(f"Setting {domain} to high_fit for testing.")
+            return domain
         else:
             print("No companies found.")
             return None
@@ -1,33 +1,34 @@
 
 import sys
 import os
-import json
+import orjson
 sys.path.append(os.getcwd())
 
-from sqlmodel import select
-from src.storage.db import get_session
+from sqlmodel import select, func
+from src.storage.db import get_readonly_session
 from src.storage.models import Outreach, Contact, Company
 
 def check():
-    with get_session() as session:
-        outreaches = session.exec(select(Outreach)).all()
+    with get_readonly_session() as session:
+        total = session.exec(select(func.count(Outreach.id))).one()
+        samples = session.exec(
+            select(Outreach, Contact, Company)
+            .join(Contact, Contact.id == Outreach.contact_id)
+            .join(Company, Company.id == Contact.company_id)
+            .limit(3)
+        ).all()
         
         with open("outreach_samples_v2.txt", "w", encoding="utf-8") as f:
-            f.write(f"Total outreaches: {len(outreaches)}\n")
+            f.write(f"Total outreaches: {total}\n")
             
-            for i, outreach in enumerate(outreaches[:3]):
-                contact = session.get(Contact, outreach.contact_id)
-                if not contact:
-                    continue
-                company = contact.company
-                
+            for i, (outreach, contact, company) in enumerate(samples):
                 f.write(f"\n--- SAMPLE {i+1} ---\n")
                 f.write(f"To: {contact.name} <{contact.email}>\n")
                 f.write(f"Company: {company.name} ({company.domain})\n")
                 f.write(f"Template: {outreach.template_id}\n")
                 
                 try:
-                    content = json.loads(outreach.content)
+                    content = orjson.loads(outreach.content)
                     f.write(f"Subject: {content.get('subject')}\n")
                     f.write("Body:\n")
                     f.write(content.get('body'))
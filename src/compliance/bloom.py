@@ -0,0 +1,35 @@
+"""
+Bloom Filter
+
+Small in-process Bloom filter used as a negative pre-check in front of
+suppression list lookups. It never returns a false negative, so a miss
+means the key is definitely absent; a hit only means "maybe" and must be
+confirmed against the database.
+"""
+
+import hashlib
+import math
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over string keys (double hashing on blake2b)."""
+
+    def __init__(self, capacity: int, error_rate: float = 1e-4):
+        capacity = max(capacity, 1)
+        self.num_bits = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
@@ -9,7 +9,7 @@ ensures only publicly available business data is stored.
 
 from datetime import datetime
 from typing import Optional
-from sqlmodel import select, Session
+from sqlmodel import select, delete, func, Session
 from loguru import logger
 
 from src.storage.db import get_session
@@ -62,20 +62,14 @@ class DataProtectionManager:
         contact_id = contact.id
 
         # Step 3: Delete all reply records
-        replies = session.exec(
-            select(Reply).where(Reply.contact_id == contact_id)
-        ).all()
-        for reply in replies:
-            session.delete(reply)
-            result["replies_deleted"] += 1
+        result["replies_deleted"] = session.exec(
+            delete(Reply).where(Reply.contact_id == contact_id)
+        ).rowcount
 
         # Step 4: Delete all outreach records
-        outreach_records = session.exec(
-            select(Outreach).where(Outreach.contact_id == contact_id)
-        ).all()
-        for record in outreach_records:
-            session.delete(record)
-            result["outreach_records_deleted"] += 1
+        result["outreach_records_deleted"] = session.exec(
+            delete(Outreach).where(Outreach.contact_id == contact_id)
+        ).rowcount
 
         # Step 5: Delete the contact
         session.delete(contact)
@@ -120,35 +114,27 @@ class DataProtectionManager:
             return result
 
         # Step 3: Delete all contact data for this company
-        contacts = session.exec(
-            select(Contact).where(Contact.company_id == company.id)
+        emails = session.exec(
+            select(Contact.email).where(Contact.company_id == company.id)
         ).all()
 
-        for contact in contacts:
-            # Delete replies
-            replies = session.exec(
-                select(Reply).where(Reply.contact_id == contact.id)
-            ).all()
-            for reply in replies:
-                session.delete(reply)
-                result["replies_deleted"] += 1
-
-            # Delete outreach
-            outreach_records = session.exec(
-                select(Outreach).where(Outreach.contact_id == contact.id)
-            ).all()
-            for record in outreach_records:
-                session.delete(record)
-                result["outreach_records_deleted"] += 1
-
-            # Suppress each contact email
-            if contact.email:
-                self.suppression_manager.suppress_email(
-                    session, contact.email, reason="data_deletion_request"
-                )
-
-            session.delete(contact)
-            result["contacts_deleted"] += 1
+        # Suppress every contact email in one batch
+        self.suppression_manager.bulk_suppress_emails(
+            session, list(emails), reason="data_deletion_request"
+        )
+
+        if emails:
+            # Let the database resolve the company's contacts instead of binding an IN-list
+            contact_ids = select(Contact.id).where(Contact.company_id == company.id)
+            result["replies_deleted"] = session.exec(
+                delete(Reply).where(Reply.contact_id.in_(contact_ids))
+            ).rowcount
+            result["outreach_records_deleted"] = session.exec(
+                delete(Outreach).where(Outreach.contact_id.in_(contact_ids))
+            ).rowcount
+            result["contacts_deleted"] = session.exec(
+                delete(Contact).where(Contact.company_id == company.id)
+            ).rowcount
 
         # Step 4: Delete the company
         session.delete(company)
@@ -168,13 +154,13 @@ class DataProtectionManager:
         Audit all stored data to verify it comes from publicly available
         business sources. Returns a summary of stored data types.
         """
-        companies = session.exec(select(Company)).all()
-        contacts = session.exec(select(Contact)).all()
+        total_companies = session.exec(select(func.count(Company.id))).one()
+        total_contacts = session.exec(select(func.count(Contact.id))).one()
 
         audit = {
             "timestamp": datetime.utcnow().isoformat(),
-            "total_companies": len(companies),
-            "total_contacts": len(contacts),
+            "total_companies": total_companies,
+            "total_contacts": total_contacts,
             "data_fields_stored": {
                 "company": [
                     "domain (public)",
@@ -7,13 +7,52 @@ opted out, bounced, or been manually suppressed. Every outreach action
 must check suppression status before sending.
 """
 
+import time
 from datetime import datetime
-from typing import List, Optional
-from sqlmodel import select, Session
+from typing import List, Optional, Tuple
+from sqlalchemy import bindparam, lambda_stmt
+from sqlmodel import select, insert, func, literal, and_, or_, Session
 from loguru import logger
 
 from src.storage.db import get_session
 from src.storage.models import SuppressionList, Contact, Outreach
+from src.compliance.bloom import BloomFilter
+
+# Rebuild the in-memory pre-check at least this often so suppressions
+# written by other processes/managers are picked up.
+BLOOM_MAX_AGE_SECONDS = 300
+
+# Short-lived memo of addresses found NOT suppressed; cleared on every new
+# suppression made through this manager. Positive results are never cached.
+NEGATIVE_CACHE_TTL_SECONDS = 60
+NEGATIVE_CACHE_MAX_SIZE = 10_000
+
+# Keep IN (...) lists well below SQLite's bound-parameter limit
+FILTER_BATCH_SIZE = 500
+
+# Lookup statements are built once; lambda_stmt caches their compiled SQL
+# so hot-path calls only bind parameters.
+_ENTRY_BY_VALUE = lambda_stmt(
+    lambda: select(SuppressionList).where(
+        SuppressionList.type == bindparam("entry_type"),
+        SuppressionList.value == bindparam("value")
+    )
+)
+_EMAIL_OR_DOMAIN_MATCH = lambda_stmt(
+    lambda: select(SuppressionList).where(
+        or_(
+            and_(SuppressionList.type == "email", SuppressionList.value == bindparam("email")),
+            and_(SuppressionList.type == "domain", SuppressionList.value == bindparam("domain"))
+        )
+    ).order_by(SuppressionList.type.desc()).limit(1)  # prefer the exact email entry
+)
+
+
+def _normalize_email(email: str) -> Tuple[str, Optional[str]]:
+    """Return the lowercased address and its domain (None when there is no '@')."""
+    email_lower = email.strip().lower()
+    _, sep, domain = email_lower.rpartition("@")
+    return email_lower, (domain or None) if sep else None
 
 
 class SuppressionManager:
@@ -22,41 +61,110 @@ class SuppressionManager:
     must consult this manager before sending any communication.
     """
 
+    def __init__(self):
+        self._bloom: Optional[BloomFilter] = None
+        self._bloom_built_at = 0.0
+        self._not_suppressed: dict = {}  # email -> time it was found not suppressed
+
+    def _get_bloom(self, session: Session) -> BloomFilter:
+        """Return the suppression pre-check filter, (re)building it when missing or stale."""
+        if self._bloom is None or time.monotonic() - self._bloom_built_at > BLOOM_MAX_AGE_SECONDS:
+            entries = session.exec(select(SuppressionList.type, SuppressionList.value)).all()
+            # Headroom for entries added through this manager before the next rebuild
+            bloom = BloomFilter(capacity=len(entries) * 2 + 1024)
+            for entry_type, value in entries:
+                bloom.add(f"{entry_type[0]}:{value}")
+            self._bloom = bloom
+            self._bloom_built_at = time.monotonic()
+        return self._bloom
+
+    def _bloom_add(self, entry_type: str, value: str):
+        """Record a new suppression in the pre-check filter and the negative cache."""
+        if self._bloom is not None:
+            self._bloom.add(f"{entry_type[0]}:{value}")
+        # A new domain entry can affect any cached address, so drop them all
+        self._not_suppressed.clear()
+
+    def _find_entry(self, session: Session, entry_type: str, value: str) -> Optional[SuppressionList]:
+        """Look up a single suppression entry by type and normalized value."""
+        return session.execute(
+            _ENTRY_BY_VALUE, {"entry_type": entry_type, "value": value}
+        ).scalars().first()
+
     def is_suppressed(self, session: Session, email: str) -> bool:
         """
         Check if an email address or its domain is on the suppression list.
         Returns True if the contact must NOT be emailed.
         """
-        email_lower = email.strip().lower()
-        domain = email_lower.split("@")[-1] if "@" in email_lower else None
+        email_lower, domain = _normalize_email(email)
 
-        # Check exact email suppression
-        email_match = session.exec(
-            select(SuppressionList).where(
-                SuppressionList.type == "email",
-                SuppressionList.value == email_lower
-            )
-        ).first()
+        checked_at = self._not_suppressed.get(email_lower)
+        if checked_at is not None and time.monotonic() - checked_at <= NEGATIVE_CACHE_TTL_SECONDS:
+            return False
 
-        if email_match:
-            logger.debug(f"Suppressed (email match): {email_lower} — reason: {email_match.reason}")
-            return True
+        # Bloom pre-check: a miss is definitive, only possible hits go to the DB
+        bloom = self._get_bloom(session)
+        if f"e:{email_lower}" not in bloom and (not domain or f"d:{domain}" not in bloom):
+            self._remember_not_suppressed(email_lower)
+            return False
 
-        # Check domain-level suppression
-        if domain:
-            domain_match = session.exec(
-                select(SuppressionList).where(
-                    SuppressionList.type == "domain",
-                    SuppressionList.value == domain
-                )
-            ).first()
+        # Check email and domain suppression in a single query
+        match = session.execute(
+            _EMAIL_OR_DOMAIN_MATCH, {"email": email_lower, "domain": domain}
+        ).scalars().first()
 
-            if domain_match:
-                logger.debug(f"Suppressed (domain match): {email_lower} — reason: {domain_match.reason}")
-                return True
+        if match:
+            logger.debug(f"Suppressed ({match.type} match): {email_lower} — reason: {match.reason}")
+            return True
 
+        self._remember_not_suppressed(email_lower)
         return False
 
+    def _remember_not_suppressed(self, email_lower: str):
+        """Memoize a negative is_suppressed result for NEGATIVE_CACHE_TTL_SECONDS."""
+        if len(self._not_suppressed) >= NEGATIVE_CACHE_MAX_SIZE:
+            # Drop the oldest entry (dicts keep insertion order)
+            self._not_suppressed.pop(next(iter(self._not_suppressed)))
+        self._not_suppressed[email_lower] = time.monotonic()
+
+    def filter_suppressed(self, session: Session, emails: List[str]) -> set:
+        """
+        Batch form of is_suppressed: return the subset of `emails` that
+        must NOT be emailed, using one query per batch instead of one per address.
+        """
+        bloom = self._get_bloom(session)
+        candidates = {}
+        for email in emails:
+            email_lower, domain = _normalize_email(email)
+            # Bloom pre-check: only possible hits go to the DB
+            if f"e:{email_lower}" in bloom or (domain and f"d:{domain}" in bloom):
+                candidates.setdefault(email_lower, []).append(email)
+        if not candidates:
+            return set()
+
+        suppressed_emails, suppressed_domains = set(), set()
+        normalized = list(candidates)
+        for start in range(0, len(normalized), FILTER_BATCH_SIZE):
+            batch = normalized[start:start + FILTER_BATCH_SIZE]
+            domains = {email.rpartition("@")[2] for email in batch if "@" in email}
+            rows = session.exec(
+                select(SuppressionList.type, SuppressionList.value).where(
+                    or_(
+                        and_(SuppressionList.type == "email", SuppressionList.value.in_(batch)),
+                        and_(SuppressionList.type == "domain", SuppressionList.value.in_(domains))
+                    )
+                )
+            ).all()
+            for entry_type, value in rows:
+                (suppressed_emails if entry_type == "email" else suppressed_domains).add(value)
+
+        suppressed = set()
+        for email_lower, originals in candidates.items():
+            _, domain = _normalize_email(email_lower)
+            if email_lower in suppressed_emails or domain in suppressed_domains:
+                suppressed.update(originals)
+        return suppressed
+
     def suppress_email(self, session: Session, email: str, reason: str = "manual") -> bool:
         """
         Add an email address to the suppression list.
@@ -64,12 +172,7 @@ class SuppressionManager:
         """
         email_lower = email.strip().lower()
 
-        existing = session.exec(
-            select(SuppressionList).where(
-                SuppressionList.type == "email",
-                SuppressionList.value == email_lower
-            )
-        ).first()
+        existing = self._find_entry(session, "email", email_lower)
 
         if existing:
             logger.info(f"Email already suppressed: {email_lower}")
@@ -82,9 +185,37 @@ class SuppressionManager:
             created_at=datetime.utcnow()
         )
         session.add(entry)
+        self._bloom_add("email", email_lower)
         logger.info(f"Suppressed email: {email_lower} (reason: {reason})")
         return True
 
+    def bulk_suppress_emails(self, session: Session, emails: List[str], reason: str = "manual") -> int:
+        """
+        Add many email addresses to the suppression list in a single
+        INSERT OR IGNORE. Addresses already suppressed are skipped.
+        Returns the number of newly added entries.
+        """
+        values = sorted({email.strip().lower() for email in emails if email})
+        if not values:
+            return 0
+
+        # Pending ORM entries must reach the table before OR IGNORE can skip them
+        session.flush()
+
+        created_at = datetime.utcnow()
+        added = session.exec(
+            insert(SuppressionList.__table__).prefix_with("OR IGNORE"),
+            params=[
+                {"type": "email", "value": value, "reason": reason, "created_at": created_at}
+                for value in values
+            ]
+        ).rowcount
+        for value in values:
+            self._bloom_add("email", value)
+
+        logger.info(f"Suppressed {added} of {len(values)} emails (reason: {reason})")
+        return added
+
     def suppress_domain(self, session: Session, domain: str, reason: str = "manual") -> bool:
         """
         Add an entire domain to the suppression list.
@@ -92,12 +223,7 @@ class SuppressionManager:
         """
         domain_lower = domain.strip().lower()
 
-        existing = session.exec(
-            select(SuppressionList).where(
-                SuppressionList.type == "domain",
-                SuppressionList.value == domain_lower
-            )
-        ).first()
+        existing = self._find_entry(session, "domain", domain_lower)
 
         if existing:
             logger.info(f"Domain already suppressed: {domain_lower}")
@@ -110,18 +236,14 @@ class SuppressionManager:
             created_at=datetime.utcnow()
         )
         session.add(entry)
+        self._bloom_add("domain", domain_lower)
         logger.info(f"Suppressed domain: {domain_lower} (reason: {reason})")
         return True
 
     def unsuppress_email(self, session: Session, email: str) -> bool:
         """Remove an email from the suppression list."""
         email_lower = email.strip().lower()
-        entry = session.exec(
-            select(SuppressionList).where(
-                SuppressionList.type == "email",
-                SuppressionList.value == email_lower
-            )
-        ).first()
+        entry = self._find_entry(session, "email", email_lower)
 
         if entry:
             session.delete(entry)
@@ -133,12 +255,7 @@ class SuppressionManager:
     def unsuppress_domain(self, session: Session, domain: str) -> bool:
         """Remove a domain from the suppression list."""
         domain_lower = domain.strip().lower()
-        entry = session.exec(
-            select(SuppressionList).where(
-                SuppressionList.type == "domain",
-                SuppressionList.value == domain_lower
-            )
-        ).first()
+        entry = self._find_entry(session, "domain", domain_lower)
 
         if entry:
             session.delete(entry)
@@ -156,25 +273,30 @@ class SuppressionManager:
         """
         count = 0
 
-        # Opt-out contacts
-        opt_out_contacts = session.exec(
-            select(Contact).where(Contact.outreach_status == "opt_out")
-        ).all()
-
-        for contact in opt_out_contacts:
-            if contact.email and self.suppress_email(session, contact.email, reason="opt_out"):
-                count += 1
-
-        # Bounced contacts
-        bounced_contacts = session.exec(
-            select(Contact).where(Contact.outreach_status == "bounced")
-        ).all()
-
-        for contact in bounced_contacts:
-            if contact.email and self.suppress_email(session, contact.email, reason="bounced"):
-                count += 1
+        # Pending ORM entries must reach the table before OR IGNORE can skip them
+        session.flush()
+        created_at = datetime.utcnow()
+
+        # One INSERT ... SELECT per status; opt-outs first so they win over bounces
+        for status in ("opt_out", "bounced"):
+            normalized_email = func.lower(func.trim(Contact.email))
+            contacts_to_suppress = select(
+                literal("email"), normalized_email, literal(status), literal(created_at)
+            ).where(
+                Contact.outreach_status == status,
+                Contact.email != None,
+                Contact.email != ""
+            )
+            count += session.exec(
+                insert(SuppressionList.__table__)
+                .prefix_with("OR IGNORE")
+                .from_select(["type", "value", "reason", "created_at"], contacts_to_suppress)
+            ).rowcount
 
         if count > 0:
+            # New values are unknown here, so rebuild the pre-check on next use
+            self._bloom = None
+            self._not_suppressed.clear()
             logger.info(f"Synced {count} new suppressions from contact statuses.")
 
         return count
@@ -185,17 +307,23 @@ class SuppressionManager:
 
     def get_suppression_stats(self, session: Session) -> dict:
         """Return summary statistics of the suppression list."""
-        all_entries = self.get_all_suppressed(session)
+        by_type = session.exec(
+            select(SuppressionList.type, func.count(SuppressionList.id)).group_by(SuppressionList.type)
+        ).all()
+        by_reason = session.exec(
+            select(SuppressionList.reason, func.count(SuppressionList.id)).group_by(SuppressionList.reason)
+        ).all()
 
         stats = {
-            "total": len(all_entries),
+            "total": sum(count for _, count in by_type),
             "by_type": {"email": 0, "domain": 0},
             "by_reason": {}
         }
 
-        for entry in all_entries:
-            stats["by_type"][entry.type] = stats["by_type"].get(entry.type, 0) + 1
-            reason = entry.reason or "unknown"
-            stats["by_reason"][reason] = stats["by_reason"].get(reason, 0) + 1
+        for entry_type, count in by_type:
+            stats["by_type"][entry_type] = count
+        for reason, count in by_reason:
+            reason = reason or "unknown"
+            stats["by_reason"][reason] = stats["by_reason"].get(reason, 0) + count
 
         return stats
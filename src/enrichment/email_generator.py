@@ -5,13 +5,61 @@ import socket
 import dns.resolver
 import random
 import string
+import time
+from functools import lru_cache
 from typing import List, Optional, Tuple, Dict
 
+from sqlalchemy.orm import selectinload
 from sqlmodel import select
 from loguru import logger
 from src.storage.db import get_session
 from src.storage.models import Company, Contact
 
+# MX and catch-all verdicts are shared across generator instances so
+# repeated runs in the same process skip the DNS/SMTP round-trips.
+DNS_CACHE_TTL_SECONDS = 3600
+DNS_CACHE_MAX_SIZE = 4096
+_mx_cache: Dict[str, Tuple[float, Optional[str]]] = {}
+_catch_all_cache: Dict[Tuple[str, str], Tuple[float, bool]] = {}
+
+# Upper bound on companies verified in parallel (each holds an SMTP connection)
+MAX_CONCURRENT_COMPANIES = 20
+
+# Rows fetched per round-trip when streaming pending contacts
+CONTACT_BATCH_SIZE = 500
+
+# RCPT TO commands sent per SMTP session before reconnecting; keeps us under
+# recipient caps and anti-harvesting thresholds
+MAX_RCPT_PER_SESSION = 10
+
+# Reconnects allowed per address after a dropped session or a 4xx reply
+SMTP_MAX_RETRIES = 2
+
+
+def _cache_get(cache: dict, key):
+    """Return (hit, value) for a TTL cache entry."""
+    entry = cache.get(key)
+    if entry is None or time.monotonic() - entry[0] > DNS_CACHE_TTL_SECONDS:
+        return False, None
+    return True, entry[1]
+
+
+def _cache_put(cache: dict, key, value):
+    if len(cache) >= DNS_CACHE_MAX_SIZE:
+        # Drop the oldest entry (dicts keep insertion order)
+        cache.pop(next(iter(cache)))
+    cache[key] = (time.monotonic(), value)
+
+
+@lru_cache(maxsize=1024)
+def _domain_email_regex(domain: str) -> "re.Pattern":
+    """Regex matching addresses at exactly `domain` (not at longer hosts like domain.evil.com)."""
+    return re.compile(
+        rf"[a-zA-Z0-9._%+-]+@{re.escape(domain)}(?![a-zA-Z0-9-]|\.[a-zA-Z0-9])",
+        re.IGNORECASE
+    )
+
+
 class EmailGenerator:
     """
     Generates and validates corporate email addresses using pattern matching 
@@ -28,77 +76,161 @@ class EmailGenerator:
             "{last}.{first}@{domain}",    # doe.john@company.com
             "{first}{last}@{domain}"      # johndoe@company.com
         ]
-        # Regex to find emails in text
-        self.email_regex = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+        # Bound formatters, built once and reused for every contact
+        self._pattern_formatters = [p.format_map for p in self.common_patterns]
+        # Resolved once; sent in HELO for every SMTP verification
+        self._local_hostname = socket.gethostname()
 
     def _get_mx_record(self, domain: str) -> Optional[str]:
-        """Resolves the MX record for a domain."""
+        """Resolves the MX record for a domain (cached per domain)."""
+        hit, mx_host = _cache_get(_mx_cache, domain)
+        if hit:
+            return mx_host
+
         try:
             records = dns.resolver.resolve(domain, 'MX')
             # Sort by preference and pick the first one
             best_record = sorted(records, key=lambda r: r.preference)[0]
-            return str(best_record.exchange).rstrip('.')
+            mx_host = str(best_record.exchange).rstrip('.')
+        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer) as e:
+            # Definitive "no MX" answers are cached like successful lookups
+            logger.debug(f"No MX record for {domain}: {e}")
+            mx_host = None
         except Exception as e:
+            # Timeouts and other transient failures are retried on the next lookup
             logger.debug(f"Could not get MX record for {domain}: {e}")
             return None
 
-    def _verify_smtp(self, email: str, mx_host: str) -> bool:
+        _cache_put(_mx_cache, domain, mx_host)
+        return mx_host
+
+    def _verify_smtp(self, email: str, mx_host: str) -> Optional[bool]:
         """
         Connects to the mail server to verify if the email exists.
+        Returns None when the check was inconclusive (deferred, dropped or
+        unreachable server) rather than a definite accept or reject.
         Note: This may fail if port 25 is blocked by ISP or if the server catches all.
         """
+        results, resolved = self._check_candidates([[email]], mx_host)
+        if not resolved:
+            return None
+        return results[0] == email
+
+    def _open_smtp(self, mx_host: str) -> smtplib.SMTP:
+        """Connects and issues HELO/MAIL FROM, ready for RCPT TO checks."""
+        server = smtplib.SMTP(mx_host, 25, timeout=5)
+        server.set_debuglevel(0)
+        server.helo(self._local_hostname)
+        # MAIL FROM (use a dummy sender)
+        server.mail('verify@example.com')
+        return server
+
+    @staticmethod
+    def _close_smtp(server: Optional[smtplib.SMTP]):
+        if server is None:
+            return
         try:
-            # Determine local hostname
-            local_hostname = socket.gethostname()
-            
-            # Connect to SMTP server
-            server = smtplib.SMTP(mx_host, 25, timeout=5)
-            server.set_debuglevel(0)
-            
-            # HELO/EHLO
-            server.helo(local_hostname)
-            
-            # MAIL FROM (use a dummy sender)
-            server.mail('verify@example.com')
-            
-            # RCPT TO (check the actual recipient)
-            code, message = server.rcpt(email)
             server.quit()
-            
-            # 250 = Success (Address exists and can receive mail)
-            if code == 250:
-                logger.debug(f"SMTP Verify Success: {email} (Code {code})")
-                return True
-            else:
-                logger.debug(f"SMTP Verify Failed: {email} (Code {code} - {message})")
-                return False
-                
-        except socket.error as e:
-            logger.debug(f"Socket error connecting to {mx_host}: {e}")
-            return False
-        except smtplib.SMTPException as e:
-            logger.debug(f"SMTP error for {email} on {mx_host}: {e}")
-            return False
+        except Exception:
+            server.close()
+
+    def _find_valid_emails(self, candidate_lists: List[List[str]], mx_host: str) -> List[Optional[str]]:
+        """
+        For each list of candidates (in priority order), the first address the
+        server accepts, or None. Checking stops at the first 250 per list, and
+        the SMTP session is shared across lists: it is reopened after
+        MAX_RCPT_PER_SESSION recipients, and on a dropped connection or a 4xx
+        reply the address is retried on a fresh session (up to SMTP_MAX_RETRIES
+        times) instead of being reported as invalid.
+        """
+        return self._check_candidates(candidate_lists, mx_host)[0]
+
+    def _check_candidates(self, candidate_lists: List[List[str]],
+                          mx_host: str) -> Tuple[List[Optional[str]], int]:
+        """
+        _find_valid_emails plus how many of the lists (from the front) got a
+        definite answer; the lists after that were left unchecked.
+        """
+        results: List[Optional[str]] = [None] * len(candidate_lists)
+        resolved = 0
+        server = None
+        rcpt_count = 0
+
+        try:
+            for index, candidates in enumerate(candidate_lists):
+                for email in candidates:
+                    for attempt in range(SMTP_MAX_RETRIES + 1):
+                        if server is None or rcpt_count >= MAX_RCPT_PER_SESSION:
+                            self._close_smtp(server)
+                            server, rcpt_count = None, 0
+                            try:
+                                server = self._open_smtp(mx_host)
+                            except (socket.error, smtplib.SMTPException) as e:
+                                logger.debug(f"Could not open SMTP session on {mx_host}: {e}")
+                                continue
+
+                        try:
+                            code, message = server.rcpt(email)
+                            rcpt_count += 1
+                        except smtplib.SMTPServerDisconnected as e:
+                            logger.debug(f"SMTP session on {mx_host} dropped: {e}")
+                            server = None
+                            continue
+
+                        if 400 <= code < 500:
+                            # Temporary refusal (greylisting, rate limit, recipient cap)
+                            logger.debug(f"SMTP Verify Deferred: {email} (Code {code} - {message})")
+                            self._close_smtp(server)
+                            server = None
+                            continue
+                        break
+                    else:
+                        # The server kept deferring or dropping us; leave the rest unverified
+                        unchecked = len(candidate_lists) - index
+                        logger.warning(f"Giving up SMTP verification on {mx_host}; {unchecked} contacts left unverified.")
+                        return results, resolved
+
+                    # 250 = Success (Address exists and can receive mail)
+                    if code == 250:
+                        logger.debug(f"SMTP Verify Success: {email} (Code {code})")
+                        results[index] = email
+                        break
+                    logger.debug(f"SMTP Verify Failed: {email} (Code {code} - {message})")
+                resolved = index + 1
         except Exception as e:
-            logger.debug(f"Unexpected error verifying {email}: {e}")
-            return False
+            logger.debug(f"Unexpected error verifying emails on {mx_host}: {e}")
+        finally:
+            self._close_smtp(server)
+
+        return results, resolved
 
     def _is_catch_all(self, domain: str, mx_host: str) -> bool:
         """Checks if the mail server accepts emails for non-existent users."""
+        hit, is_catch_all = _cache_get(_catch_all_cache, (domain, mx_host))
+        if hit:
+            return is_catch_all
+
         # Generate a random non-existent user
         random_user = ''.join(random.choices(string.ascii_lowercase + string.digits, k=15))
         test_email = f"{random_user}@{domain}"
         
         # If verify returns True for a gibberish user, it's a catch-all
-        return self._verify_smtp(test_email, mx_host)
+        is_catch_all = self._verify_smtp(test_email, mx_host)
+        if is_catch_all is None:
+            # Inconclusive probe: treat as catch-all for this run (so nothing on the
+            # domain gets "verified") and probe again next time instead of caching
+            logger.debug(f"Catch-all probe for {domain} was inconclusive.")
+            return True
+
+        _cache_put(_catch_all_cache, (domain, mx_host), is_catch_all)
+        return is_catch_all
 
     def _extract_emails_from_text(self, text: str, domain: str) -> List[str]:
         """Finds emails in text that match the company domain."""
         if not text:
             return []
-        found = self.email_regex.findall(text)
-        # Filter for emails belonging to the domain
-        return [e.lower() for e in found if e.lower().endswith(f"@{domain}")]
+        # The domain-anchored pattern does the filtering inside the regex engine
+        return [e.lower() for e in _domain_email_regex(domain).findall(text)]
 
     def _infer_pattern(self, existing_emails: List[str], domain: str) -> Optional[str]:
         """
@@ -112,26 +244,21 @@ class EmailGenerator:
         # This requires reverse-engineering the names from the emails, which is hard without the names.
         # But we can look at the structure.
         
-        pattern_counts = {p: 0 for p in self.common_patterns}
-        
+        dotted = underscored = 0
         for email in existing_emails:
-            local_part = email.split('@')[0]
+            local_part = email.partition('@')[0]
             
             if '.' in local_part:
                 # Could be first.last or last.first
-                pattern_counts["{first}.{last}@{domain}"] += 1 # Assume first.last is more common
+                dotted += 1 # Assume first.last is more common
             elif '_' in local_part:
-                pattern_counts["{first}_{last}@{domain}"] += 1
-            else:
-                # No symbols. Hard to distinguish first vs fLast vs firstL etc.
-                # Just ignore or guess based on length?
-                pass
+                underscored += 1
+            # No symbols: hard to distinguish first vs fLast vs firstL etc., so ignore
         
-        # Get the most common pattern
-        best_pattern = max(pattern_counts, key=pattern_counts.get)
-        if pattern_counts[best_pattern] > 0:
-            return best_pattern
-        return None
+        # Get the most common pattern (ties go to first.last)
+        if dotted == underscored == 0:
+            return None
+        return "{first}.{last}@{domain}" if dotted >= underscored else "{first}_{last}@{domain}"
 
     def generate_candidates(self, contact: Contact, domain: str, pattern: Optional[str] = None) -> List[str]:
         """Generates a list of probable emails for a contact."""
@@ -156,107 +283,130 @@ class EmailGenerator:
         candidates = []
         if pattern:
             # If we have a high-confidence pattern, try that primarily
-            try:
-                candidates.append(pattern.format(**data))
-            except:
-                pass
+            candidates.append(pattern.format_map(data))
         
         # Add all common patterns as backups (or primaries if no pattern)
-        for p in self.common_patterns:
-            try:
-                cand = p.format(**data)
-                if cand not in candidates:
-                    candidates.append(cand)
-            except:
-                pass
+        candidates.extend(format_pattern(data) for format_pattern in self._pattern_formatters)
                 
-        return candidates
+        # Drop duplicates while keeping priority order
+        return list(dict.fromkeys(candidates))
 
     async def process_contacts(self):
         """Main loop to process contacts with missing emails."""
-        with get_session() as session:
+        # Companies commit independently while others are still in flight on this
+        # session; expiring on commit would make those reload their rows one by one
+        with get_session(expire_on_commit=False) as session:
             # Fetch contacts without verified emails
             # We can filter by companies that are high_fit to save time
-            statement = select(Contact, Company).join(Company).where(Contact.email == None).where(Company.fitness_level == "high_fit")
-            results = session.exec(statement).all()
+            # Companies are loaded once via selectinload rather than repeated
+            # (with their website_content) on every joined contact row.
+            statement = (
+                select(Contact)
+                .join(Company)
+                .where(Contact.email == None)
+                .where(Company.fitness_level == "high_fit")
+                .options(selectinload(Contact.company))
+                .execution_options(yield_per=CONTACT_BATCH_SIZE)
+            )
             
-            logger.info(f"Found {len(results)} contacts to process for emails.")
-            
-            # Group by company to minimize MX lookups and pattern inference
+            # Group by company to minimize MX lookups and pattern inference,
+            # streaming rows in batches instead of materializing the full result
             company_contacts = {}
-            for contact, company in results:
+            total_contacts = 0
+            for contact in session.exec(statement):
+                company = contact.company
                 if company.id not in company_contacts:
                     company_contacts[company.id] = {"company": company, "contacts": []}
                 company_contacts[company.id]["contacts"].append(contact)
+                total_contacts += 1
             
-            for company_id, data in company_contacts.items():
-                company = data["company"]
-                contacts = data["contacts"]
-                domain = company.domain
-                
-                logger.info(f"Processing {len(contacts)} contacts for {company.name} ({domain})")
-                
-                # 1. Get MX Record
-                mx_host = self._get_mx_record(domain)
-                if not mx_host:
-                    logger.warning(f"No MX record found for {domain}. Skipping SMTP verification.")
-                    # Can't verify, skip or assume unverified? Prompt says "store only those that pass".
-                    # If we can't verify, we can't store.
-                    continue
-                
-                # 2. Check for Catch-All
-                if await asyncio.to_thread(self._is_catch_all, domain, mx_host):
-                    logger.warning(f"Domain {domain} is catch-all. Cannot verify individual emails via SMTP.")
-                    # Strategies for catch-all:
-                    # 1. Use inferred pattern if very strong (e.g. matched 3+ existing emails).
-                    # 2. Store the most likely one but mark verification status as 'catch_all' or similar?
-                    # The prompt says 'store only those addresses that pass verification'.
-                    # A catch-all response technically 'passes' SMTP check (250 OK), but logic suggests it's not a verified *user*.
-                    # We will skip processing for now to be safe, or perhaps store if we have a strong pattern.
-                    # Let's verify if we have an inferred pattern.
-
-                    existing_emails = self._extract_emails_from_text(company.website_content, domain)
-                    inferred_pattern = self._infer_pattern(existing_emails, domain)
-                    
-                    if inferred_pattern:
-                        logger.info(f"Catch-all domain {domain}, but found pattern {inferred_pattern}. Using pattern to generate best guess.")
-                        # We will generate just ONE candidate based on the pattern and store it, 
-                        # but perhaps we shouldn't mark it as fully verified?
-                        # The Contact model has 'is_verified'. We can leave it False or add a note.
-                        # For this task, "store only those addresses that pass verification" is strict.
-                        # I will SKIP storing for catch-all to adhere to strict interpretation, 
-                        # OR I could assume "pass verification" means "sending to it won't bounce immediate".
-                        # But that's dangerous for sender reputation.
-                        # Decision: Skip catch-all domains for "verified" email storage.
-                        pass
-                    continue
-
-                # 3. Infer Pattern from website content
-                existing_emails = self._extract_emails_from_text(company.website_content, domain)
-                inferred_pattern = self._infer_pattern(existing_emails, domain)
-                if inferred_pattern:
-                    logger.info(f"Inferred email pattern for {domain}: {inferred_pattern}")
-                
-                # 4. Generate and Verify
-                for contact in contacts:
-                    candidates = self.generate_candidates(contact, domain, inferred_pattern)
-                    
-                    found_valid = False
-                    for email in candidates:
-                        # Use run_in_executor for blocking SMTP calls
-                        is_valid = await asyncio.to_thread(self._verify_smtp, email, mx_host)
-                        
-                        if is_valid:
-                            contact.email = email
-                            contact.is_verified = True
-                            session.add(contact)
-                            session.commit()
-                            logger.success(f"Verified email for {contact.name}: {email}")
-                            found_valid = True
-                            break # Stop after finding one valid email
-                    
-                    if not found_valid:
-                        logger.info(f"Could not verify any email for {contact.name}")
+            logger.info(f"Found {total_contacts} contacts to process for emails.")
+            
+            # Companies are verified concurrently; the blocking DNS/SMTP calls run
+            # in worker threads while DB writes stay on the event loop thread.
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_COMPANIES)
+            outcomes = await asyncio.gather(
+                *(
+                    self._process_company(session, semaphore, data["company"], data["contacts"])
+                    for data in company_contacts.values()
+                ),
+                return_exceptions=True
+            )
+            for data, outcome in zip(company_contacts.values(), outcomes):
+                if isinstance(outcome, Exception):
+                    logger.error(f"Email generation failed for {data['company'].domain}: {outcome}")
+
+    async def _process_company(self, session, semaphore: asyncio.Semaphore, company: Company, contacts: List[Contact]):
+        """Finds and verifies emails for the contacts of a single company."""
+        async with semaphore:
+            await self._verify_company_contacts(session, company, contacts)
+
+    async def _verify_company_contacts(self, session, company: Company, contacts: List[Contact]):
+        """MX lookup, catch-all check and candidate verification for one company."""
+        domain = company.domain
+        
+        logger.info(f"Processing {len(contacts)} contacts for {company.name} ({domain})")
+        
+        # 1. Get MX Record
+        mx_host = await asyncio.to_thread(self._get_mx_record, domain)
+        if not mx_host:
+            logger.warning(f"No MX record found for {domain}. Skipping SMTP verification.")
+            # Can't verify, skip or assume unverified? Prompt says "store only those that pass".
+            # If we can't verify, we can't store.
+            return
+        
+        # 2. Check for Catch-All
+        if await asyncio.to_thread(self._is_catch_all, domain, mx_host):
+            logger.warning(f"Domain {domain} is catch-all. Cannot verify individual emails via SMTP.")
+            # Strategies for catch-all:
+            # 1. Use inferred pattern if very strong (e.g. matched 3+ existing emails).
+            # 2. Store the most likely one but mark verification status as 'catch_all' or similar?
+            # The prompt says 'store only those addresses that pass verification'.
+            # A catch-all response technically 'passes' SMTP check (250 OK), but logic suggests it's not a verified *user*.
+            # We will skip processing for now to be safe, or perhaps store if we have a strong pattern.
+            # Let's verify if we have an inferred pattern.
+
+            existing_emails = self._extract_emails_from_text(company.website_content, domain)
+            inferred_pattern = self._infer_pattern(existing_emails, domain)
+            
+            if inferred_pattern:
+                logger.info(f"Catch-all domain {domain}, but found pattern {inferred_pattern}. Using pattern to generate best guess.")
+                # We will generate just ONE candidate based on the pattern and store it, 
+                # but perhaps we shouldn't mark it as fully verified?
+                # The Contact model has 'is_verified'. We can leave it False or add a note.
+                # For this task, "store only those addresses that pass verification" is strict.
+                # I will SKIP storing for catch-all to adhere to strict interpretation, 
+                # OR I could assume "pass verification" means "sending to it won't bounce immediate".
+                # But that's dangerous for sender reputation.
+                # Decision: Skip catch-all domains for "verified" email storage.
+                pass
+            return
+
+        # 3. Infer Pattern from website content
+        existing_emails = self._extract_emails_from_text(company.website_content, domain)
+        inferred_pattern = self._infer_pattern(existing_emails, domain)
+        if inferred_pattern:
+            logger.info(f"Inferred email pattern for {domain}: {inferred_pattern}")
+        
+        # 4. Generate and Verify (each contact's candidates in priority order, sharing SMTP sessions)
+        contact_candidates = [
+            (contact, self.generate_candidates(contact, domain, inferred_pattern)) for contact in contacts
+        ]
+        valid_emails = await asyncio.to_thread(
+            self._find_valid_emails, [candidates for _, candidates in contact_candidates], mx_host
+        )
+
+        for (contact, _), email in zip(contact_candidates, valid_emails):
+            if email:
+                contact.email = email
+                contact.is_verified = True
+                session.add(contact)
+                logger.success(f"Verified email for {contact.name}: {email}")
+            else:
+                logger.info(f"Could not verify any email for {contact.name}")
+
+        # One commit per company instead of one per verified contact
+        session.commit()
 
 if __name__ == "__main__":
     generator = EmailGenerator()
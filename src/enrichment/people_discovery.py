@@ -1,15 +1,44 @@
 import asyncio
 import aiohttp
+import ahocorasick
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Tuple
-from bs4 import BeautifulSoup
+import lxml.html
+from bs4 import BeautifulSoup, NavigableString, Tag
+from lxml import etree
 from loguru import logger
 from urllib.parse import urljoin, urlparse
-from sqlmodel import select, Session
+from sqlalchemy.orm import selectinload
+from sqlmodel import select, update, Session
 
 from src.storage.db import get_session
 from src.storage.models import Company, Contact
 
+# Upper bound on companies scraped in parallel
+MAX_CONCURRENT_COMPANIES = 20
+
+# Team pages fetched per company, and which link patterns to prefer when capping
+MAX_TEAM_PAGES = 5
+TEAM_PAGE_PRIORITY = {
+    pattern: rank for rank, pattern in enumerate(
+        ["/leadership", "/team", "/our-team", "/people", "/about-us", "/about", "/company"]
+    )
+}
+
+# lxml's C parser is several times faster than the pure-Python html.parser
+HTML_PARSER = "lxml"
+
+# Link discovery only needs anchors: compiled once, run on a bare lxml tree
+ANCHOR_XPATH = etree.XPath("//a[@href]")
+
+# Profile links used to attach a LinkedIn URL (and sometimes the name) to a contact
+LINKEDIN_HREF = re.compile(r"linkedin\.com/in/")
+
+# Text under these tags is never rendered, so it can't hold a name or title
+NON_VISIBLE_TAGS = {"script", "style", "noscript", "template"}
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+
 class PeopleDiscoverer:
     """
     Discovers relevant stakeholders (decision makers) within qualified companies.
@@ -71,10 +100,16 @@ class PeopleDiscoverer:
             "Engineering Manager": 4,
             "Product Manager": 3,
         }
+        # Aho-Corasick automaton over all roles: each text node is scanned once,
+        # in linear time, no matter how many roles are configured
+        self._role_automaton = ahocorasick.Automaton()
+        for role, score in self.role_patterns.items():
+            self._role_automaton.add_word(role.lower(), (len(role), score, role))
+        self._role_automaton.make_automaton()
         
     async def _fetch(self, session: aiohttp.ClientSession, url: str) -> Optional[str]:
         try:
-            async with session.get(url, headers=self.headers, timeout=self.timeout, allow_redirects=True) as response:
+            async with session.get(url, allow_redirects=True) as response:
                 if response.status == 200:
                     return await response.text()
                 # logger.warning(f"Failed to fetch {url}: Status {response.status}")
@@ -83,32 +118,97 @@ class PeopleDiscoverer:
             logger.error(f"Error fetching {url}: {e}")
             return None
 
+    def _parse_lxml(self, html: str):
+        """Parses a page straight into an lxml tree; None if it has no parsable content."""
+        try:
+            return lxml.html.fromstring(html)
+        except ValueError:
+            # str input with an XML encoding declaration must be handed over as bytes
+            try:
+                return lxml.html.fromstring(html.encode("utf-8"))
+            except (ValueError, etree.ParserError):
+                return None
+        except etree.ParserError:
+            return None
+
     def _find_team_links(self, html: str, base_url: str) -> List[str]:
-        """Finds potential team/about pages from the homepage."""
-        links = []
+        """
+        Finds potential team/about pages from the homepage. Links are canonicalized
+        (so /about, /about/ and /about#x are fetched once), deep paths are skipped
+        and at most MAX_TEAM_PAGES are returned, most promising pattern first.
+        """
         if not html:
-            return links
+            return []
             
-        soup = BeautifulSoup(html, "html.parser")
-        domain = urlparse(base_url).netloc
+        root = self._parse_lxml(html)
+        if root is None:
+            return []
+        base = urlparse(base_url)
+        domain = base.netloc.lower()
+        homepage = f"{base.scheme.lower()}://{domain}{base.path.rstrip('/')}"
         
-        for a in soup.find_all("a", href=True):
-            href = a["href"]
-            full_url = urljoin(base_url, href)
+        links = {}  # canonical url -> best (lowest) pattern priority
+        for a in ANCHOR_XPATH(root):
+            parsed = urlparse(urljoin(base_url, a.get("href")))
             
             # Ensure it's internal
-            if urlparse(full_url).netloc != domain:
+            if parsed.netloc.lower() != domain:
                 continue
                 
-            path = urlparse(full_url).path.lower()
-            text = a.get_text().lower()
+            path = parsed.path.lower()
+            text = a.text_content().lower()
             
             for pattern in self.team_page_patterns:
-                if pattern in path or pattern in text:
-                    links.append(full_url)
-                    break
+                if pattern in path:
+                    # Pages nested well below the pattern (e.g. /about/press/2023/x) are rarely team pages
+                    if path.partition(pattern)[2].strip("/").count("/") >= 2:
+                        break
+                elif pattern not in text:
+                    continue
+                
+                # Drop query strings and fragments; they almost never select a different team page
+                url = f"{parsed.scheme.lower()}://{domain}{parsed.path.rstrip('/')}"
+                if url != homepage:
+                    priority = TEAM_PAGE_PRIORITY.get(pattern, len(TEAM_PAGE_PRIORITY))
+                    links[url] = min(priority, links.get(url, priority))
+                break
         
-        return list(set(links))
+        return sorted(links, key=links.get)[:MAX_TEAM_PAGES]
+
+    def _find_roles(self, text_lower: str) -> List[Tuple[int, int, str]]:
+        """Returns (start, score, role) for every whole-word role mention in the text."""
+        matches = []
+        last = len(text_lower) - 1
+        for end, (length, score, role) in self._role_automaton.iter(text_lower):
+            start = end - length + 1
+            # Whole words only, e.g. "CTO" must not match inside "director"
+            if start > 0 and text_lower[start - 1].isalnum():
+                continue
+            if end < last and text_lower[end + 1].isalnum():
+                continue
+            matches.append((start, score, role))
+        return sorted(matches)
+
+    def _iter_text_nodes(self, soup: BeautifulSoup):
+        """
+        Yields (text_node, heading) for visible, non-blank text nodes in document
+        order with a single walk of the tree. `heading` is the nearest heading
+        preceding the node's parent (what parent.find_previous(h1..h6) returns),
+        tracked during the walk instead of re-scanning backwards per match.
+        """
+        last_heading = None
+        heading_before = {}  # id(tag) -> last heading started before that tag
+        for node in soup.descendants:
+            if isinstance(node, Tag):
+                heading_before[id(node)] = last_heading
+                if node.name in HEADING_TAGS:
+                    last_heading = node
+                continue
+            if type(node) is not NavigableString:
+                continue  # comments, doctypes, CDATA
+            if node.parent.name in NON_VISIBLE_TAGS or node.isspace():
+                continue
+            yield node, heading_before.get(id(node.parent))
 
     def _extract_contacts_from_html(self, html: str, company_id: int) -> List[Contact]:
         """Parses HTML to find people and titles."""
@@ -116,7 +216,10 @@ class PeopleDiscoverer:
         if not html:
             return contacts
             
-        soup = BeautifulSoup(html, "html.parser")
+        soup = BeautifulSoup(html, HTML_PARSER)
+        # One substring scan of the raw page; most pages have no profile links at
+        # all, and then the per-match container searches below can be skipped
+        page_has_linkedin = "linkedin" in html
         
         # Strategy 1: Look for elements containing title keywords
         # and try to find the associated name.
@@ -135,26 +238,20 @@ class PeopleDiscoverer:
         # Heuristic: Container with small amount of text, potentially an image?
         # Actually, let's search for the titles first.
         
-        for text_node in soup.find_all(string=True):
+        for text_node, preceding_heading in self._iter_text_nodes(soup):
             clean_text = clean(text_node)
-            if not clean_text:
+            if not clean_text or len(clean_text) >= 100: # Title shouldn't be too long
                 continue
                 
             # Check if this text matches a known title
             matched_title = None
             matched_score = 0
             
-            for role, score in self.role_patterns.items():
-                if role.lower() in clean_text.lower():
-                    # Check if it's a good match (not just a substring of something unrelated)
-                    # For now simple containment.
-                    if len(clean_text) < 100: # Title shouldn't be too long
-                        if score > matched_score:
-                            matched_score = score
-                            matched_title = role # Use the canonical role name or the text?
-                            # Use text but clean it up? Or canonical?
-                            # Use the text found if it's short, else canonical
-                            matched_title = clean_text if len(clean_text) < 50 else role
+            for start, score, role in self._find_roles(clean_text.lower()):
+                if score > matched_score:
+                    matched_score = score
+                    # Use the text found if it's short, else canonical
+                    matched_title = clean_text if len(clean_text) < 50 else role
 
             if matched_title:
                 # We found a title. Now find the name.
@@ -171,16 +268,10 @@ class PeopleDiscoverer:
                     if 3 < len(prev_text) < 30 and prev_text[0].isupper():
                         name = prev_text
                 
-                # Check parent's previous sibling (common in grid layouts: <div>Name</div><div>Title</div>)
-                if not name:
-                    parent_prev = parent.parent.find_previous_sibling() if parent.parent else None
-                    if parent_prev: # careful here
-                        pass # complicated logic, skipping for simplicity
-                        
                 # Check for Heading tags nearby
                 if not name:
-                    # Look for the nearest preceding H tag
-                    h_tag = parent.find_previous(["h1", "h2", "h3", "h4", "h5", "h6"])
+                    # Nearest preceding H tag, tracked during the walk
+                    h_tag = preceding_heading
                     if h_tag:
                         h_text = clean(h_tag.get_text())
                         if 3 < len(h_text) < 30:
@@ -189,12 +280,12 @@ class PeopleDiscoverer:
                 # Strategy 2: Check for LinkedIn links nearby
                 linkedin_url = None
                 # Search within the same container (go up 2-3 levels)
-                container = parent
+                container = parent if page_has_linkedin else None
                 for _ in range(3):
                     if not container or container.name == "body":
                         break
                     
-                    link = container.find("a", href=re.compile(r"linkedin\.com/in/"))
+                    link = container.find("a", href=LINKEDIN_HREF)
                     if link:
                         linkedin_url = link["href"]
                         # Sometimes the name IS the link text
@@ -225,15 +316,11 @@ class PeopleDiscoverer:
         unique = {}
         for contact, score in contacts_with_score:
             key = contact.name.lower()
-            if key not in unique:
+            current = unique.get(key)
+            # Keep the new one if it's the first, has a better score or adds info (e.g. linkedin)
+            if (current is None or score > current[1]
+                    or (contact.linkedin_url and not current[0].linkedin_url)):
                 unique[key] = (contact, score)
-            else:
-                existing_contact, existing_score = unique[key]
-                # Update if new one has better score or more info (e.g. linkedin)
-                if score > existing_score:
-                    unique[key] = (contact, score)
-                elif not existing_contact.linkedin_url and contact.linkedin_url:
-                    unique[key] = (contact, score)
         
         # Sort by score descending
         sorted_contacts = sorted(unique.values(), key=lambda x: x[1], reverse=True)
@@ -248,7 +335,12 @@ class PeopleDiscoverer:
             # Let's assume threshold is stored in fitness_level or we use score.
             # Using fitness_level='high_fit' as per previous prompt implications.
             
-            statement = select(Company).where(Company.fitness_level == "high_priority")
+            # Existing contacts come along in one extra query, for the duplicate check on save
+            statement = (
+                select(Company)
+                .where(Company.fitness_level == "high_priority")
+                .options(selectinload(Company.contacts))
+            )
             companies = session.exec(statement).all()
             
             if not companies:
@@ -257,58 +349,101 @@ class PeopleDiscoverer:
 
             logger.info(f"Found {len(companies)} high-fit companies for people discovery.")
             
-            async with aiohttp.ClientSession() as http_session:
-                for company in companies:
-                    logger.info(f"Discovering people for {company.name} ({company.domain})...")
-                    
-                    # 1. Scrape Homepage to find subpages if we haven't stored them,
-                    # or just guess standard paths.
-                    base_url = f"https://{company.domain}"
-                    homepage_html = await self._fetch(http_session, base_url)
-                    
-                    if not homepage_html:
-                        logger.warning(f"Could not access {base_url} for people discovery")
-                        continue
-                        
-                    team_links = self._find_team_links(homepage_html, base_url)
-                    logger.info(f"Found {len(team_links)} potential team pages: {team_links}")
-                    
-                    # Include homepage itself as some stick team there
-                    pages_to_scan = [base_url] + team_links
-                    
-                    all_found_contacts = []
-                    
-                    for url in pages_to_scan:
-                        logger.info(f"Scanning {url}...")
-                        html = await self._fetch(http_session, url)
-                        if html:
-                            found = self._extract_contacts_from_html(html, company.id)
-                            all_found_contacts.extend(found)
-                    
-                    # Deduplicate and Rank
-                    final_contacts = self._deduplicate_contacts(all_found_contacts)
-                    
-                    logger.success(f"Found {len(final_contacts)} unique relevant contacts for {company.name}")
-                    
-                    # Save to DB
-                    for contact in final_contacts:
-                        # Check if exists
-                        existing = session.exec(
-                            select(Contact).where(Contact.company_id == company.id).where(Contact.name == contact.name)
-                        ).first()
-                        
-                        if not existing:
-                            session.add(contact)
-                            logger.info(f"Added contact: {contact.name} - {contact.title}")
-                        else:
-                            # Update title or linkedin if missing
-                            if not existing.linkedin_url and contact.linkedin_url:
-                                existing.linkedin_url = contact.linkedin_url
-                                session.add(existing)
-                                logger.info(f"Updated contact: {contact.name}")
-                    
-                    session.commit()
+            # Companies are discovered concurrently. Results are persisted through a
+            # single writer thread so DB commits never stall in-flight fetches.
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_COMPANIES)
+            db_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="people-db")
+            # Pooled keep-alive connections and cached DNS across homepage/team-page fetches;
+            # headers and timeout are set once on the session
+            connector = aiohttp.TCPConnector(
+                limit=100, limit_per_host=4, ttl_dns_cache=600, keepalive_timeout=60
+            )
+            async with aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            ) as http_session:
+                try:
+                    results = await asyncio.gather(
+                        *(self._discover_company(http_session, semaphore, db_writer, company) for company in companies),
+                        return_exceptions=True
+                    )
+                finally:
+                    db_writer.shutdown(wait=True)
+
+            for company, result in zip(companies, results):
+                if isinstance(result, Exception):
+                    logger.error(f"People discovery failed for {company.domain}: {result}")
+
+    async def _discover_company(self, http_session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                                db_writer: ThreadPoolExecutor, company: Company):
+        """Scrapes a company's homepage and team pages and saves the ranked contacts."""
+        async with semaphore:
+            logger.info(f"Discovering people for {company.name} ({company.domain})...")
+            
+            # 1. Scrape Homepage to find subpages if we haven't stored them,
+            # or just guess standard paths.
+            base_url = f"https://{company.domain}"
+            homepage_html = await self._fetch(http_session, base_url)
+            
+            if not homepage_html:
+                logger.warning(f"Could not access {base_url} for people discovery")
+                return
+                
+            team_links = self._find_team_links(homepage_html, base_url)
+            logger.info(f"Found {len(team_links)} potential team pages: {team_links}")
+            
+            # Include homepage itself as some stick team there (reusing the fetch above)
+            all_found_contacts = self._extract_contacts_from_html(homepage_html, company.id)
+            
+            # Fetch the team pages concurrently
+            pages = await asyncio.gather(*(self._fetch(http_session, url) for url in team_links))
+            for html in pages:
+                if html:
+                    all_found_contacts.extend(self._extract_contacts_from_html(html, company.id))
+            
+            # Deduplicate and Rank
+            final_contacts = self._deduplicate_contacts(all_found_contacts)
+            
+            logger.success(f"Found {len(final_contacts)} unique relevant contacts for {company.name}")
+
+        # Snapshot of the preloaded contacts (id, linkedin_url) by name for the writer thread
+        existing_by_name = {}
+        for existing in company.contacts:
+            existing_by_name.setdefault(existing.name, (existing.id, existing.linkedin_url))
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(db_writer, self._save_contacts, existing_by_name, final_contacts)
+
+    def _save_contacts(self, existing_by_name: Dict[str, Tuple[int, Optional[str]]], final_contacts: List[Contact]):
+        """Inserts new contacts for a company and fills in missing LinkedIn URLs (own session)."""
+        with get_session() as session:
+            new_contacts = []
+            for contact in final_contacts:
+                existing = existing_by_name.get(contact.name)
+            
+                if not existing:
+                    new_contacts.append(contact)
+                    logger.info(f"Added contact: {contact.name} - {contact.title}")
+                else:
+                    # Update title or linkedin if missing
+                    existing_id, existing_linkedin_url = existing
+                    if not existing_linkedin_url and contact.linkedin_url:
+                        session.exec(
+                            update(Contact)
+                            .where(Contact.id == existing_id)
+                            .values(linkedin_url=contact.linkedin_url)
+                        )
+                        logger.info(f"Updated contact: {contact.name}")
+        
+            session.add_all(new_contacts)
+            session.commit()
 
 if __name__ == "__main__":
+    try:
+        # uvloop is only installed off Windows
+        from uvloop import run as run_loop
+    except ImportError:
+        from asyncio import run as run_loop
     discoverer = PeopleDiscoverer()
-    asyncio.run(discoverer.run())
+    run_loop(discoverer.run())
@@ -1,12 +1,23 @@
 import os
-import requests
+import asyncio
+import aiohttp
 import random
-from typing import Optional
+import time
+from typing import Dict, Optional, Tuple
 from loguru import logger
 from sqlmodel import select, Session
 from src.storage.models import Company
 from src.storage.db import get_session
 
+# Concurrent Apollo requests per run
+MAX_CONCURRENT_REQUESTS = 5
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=30)
+
+# Apollo answers per domain, kept for the life of the process (the scheduler
+# re-runs enrichment in-process) so unresolved domains aren't re-queried every run
+SIZE_CACHE_TTL_SECONDS = 24 * 3600
+_size_cache: Dict[str, Tuple[float, Optional[int]]] = {}
+
 class SizeVerificationEnricher:
     """
     Enriches companies with employee count data using external APIs.
@@ -17,7 +28,7 @@ class SizeVerificationEnricher:
         self.apollo_api_key = os.getenv("APOLLO_API_KEY")
         self.max_smb_size = 500
 
-    def fetch_employee_count(self, domain: str) -> Optional[int]:
+    async def fetch_employee_count(self, http_session: aiohttp.ClientSession, domain: str) -> Optional[int]:
         """
         Fetches employee count from an external provider (e.g., Apollo).
         Currently implements a mock for demonstration/free tier simulation.
@@ -30,33 +41,36 @@ class SizeVerificationEnricher:
             logger.warning(f"No APOLLO_API_KEY found. Using mock employee count for {domain}: {count}")
             return count
 
+        cached = _size_cache.get(domain)
+        if cached is not None and time.monotonic() - cached[0] <= SIZE_CACHE_TTL_SECONDS:
+            logger.debug(f"Using cached employee count for {domain}: {cached[1]}")
+            return cached[1]
+
         try:
             url = f"https://api.apollo.io/v1/organizations/enrich?domain={domain}"
-            headers = {
-                "Cache-Control": "no-cache", 
-                "Content-Type": "application/json", 
-                "X-Api-Key": self.apollo_api_key
-            }
-            response = requests.get(url, headers=headers)
-            if response.status_code == 200:
-                data = response.json()
-                count = data.get("organization", {}).get("estimated_num_employees")
-                return count
-            
-            logger.error(f"Apollo API error {response.status_code}: {response.text}")
-            return None
+            async with http_session.get(url) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    count = data.get("organization", {}).get("estimated_num_employees")
+                    # Only successful answers are cached (including "no estimate")
+                    _size_cache[domain] = (time.monotonic(), count)
+                    return count
+                
+                logger.error(f"Apollo API error {response.status}: {await response.text()}")
+                return None
         except Exception as e:
             logger.error(f"Error fetching size for {domain}: {e}")
             return None
 
-    def process_company(self, session: Session, company: Company):
-        """Enriches a single company with size data."""
-        if company.employee_count is not None:
-            return
+    async def _fetch_one(self, http_session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                         company: Company) -> Optional[int]:
+        """Fetches the employee count for one company, bounded by the shared semaphore."""
+        async with semaphore:
+            logger.info(f"Verifying size for {company.domain}")
+            return await self.fetch_employee_count(http_session, company.domain)
 
-        logger.info(f"Verifying size for {company.domain}")
-        count = self.fetch_employee_count(company.domain)
-        
+    def process_company(self, session: Session, company: Company, count: Optional[int]):
+        """Stores fetched size data on a single company."""
         if count is not None:
             company.employee_count = count
             session.add(company)
@@ -64,7 +78,7 @@ class SizeVerificationEnricher:
         else:
             logger.warning(f"Could not determine size for {company.domain}")
 
-    def run(self, force: bool = False):
+    async def run(self, force: bool = False):
         """Runs the size verification for all companies."""
         with get_session() as session:
             statement = select(Company).where(Company.is_scored == True)
@@ -72,19 +86,39 @@ class SizeVerificationEnricher:
                 statement = statement.where(Company.employee_count == None)
                 
             companies = session.exec(statement).all()
+            # Companies that already have a size are never re-fetched
+            companies = [company for company in companies if company.employee_count is None]
             
             if not companies:
                 logger.info("No companies found needing size verification.")
                 return
                 
             logger.info(f"Starting size verification for {len(companies)} companies.")
-            for company in companies:
-                self.process_company(session, company)
+
+            # Overlap the API round-trips; the semaphore keeps us within Apollo's rate limits
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+            headers = {
+                "Cache-Control": "no-cache", 
+                "Content-Type": "application/json", 
+                "X-Api-Key": self.apollo_api_key or ""
+            }
+            async with aiohttp.ClientSession(headers=headers, timeout=REQUEST_TIMEOUT) as http_session:
+                counts = await asyncio.gather(
+                    *(self._fetch_one(http_session, semaphore, company) for company in companies)
+                )
+
+            for company, count in zip(companies, counts):
+                self.process_company(session, company, count)
             
             session.commit()
 
 if __name__ == "__main__":
     import argparse
+    try:
+        # uvloop is only installed off Windows
+        from uvloop import run as run_loop
+    except ImportError:
+        from asyncio import run as run_loop
     from dotenv import load_dotenv
     load_dotenv()
     
@@ -93,4 +127,4 @@ if __name__ == "__main__":
     args = parser.parse_args()
     
     enricher = SizeVerificationEnricher()
-    enricher.run(force=args.force)
+    run_loop(enricher.run(force=args.force))
@@ -9,15 +9,24 @@ When a company converts (reply with interest), this module:
 """
 
 import json
+import itertools
+import ahocorasick
 from datetime import datetime
-from typing import List, Dict, Set, Optional
-from sqlmodel import select, Session
+from typing import Any, List, Dict, Set, Optional
+from sqlmodel import select, func, Session
 from loguru import logger
 
 from src.storage.db import get_session
+from src.feedback.persistence import write_json_atomic
 from src.storage.models import Company, Contact, Reply, Signal, CompanySignalLink
 
 
+# Seeds too generic to build queries from
+GENERIC_SEEDS = frozenset({"api", "sdk", "sso", "the", "and", "for"})
+
+# Max new queries per expansion run, to avoid overwhelming the search engine
+MAX_NEW_QUERIES = 25
+
 # Base query patterns that get customized with discovered patterns
 QUERY_TEMPLATES = [
     "{keyword} AI agent platform startup",
@@ -29,6 +38,25 @@ QUERY_TEMPLATES = [
     "{keyword} agent orchestration startup funding",
 ]
 
+# Industry terms picked out of company descriptions (plain substring match)
+INDUSTRY_HINTS = (
+    "fintech", "healthcare", "legal", "insurance",
+    "cybersecurity", "devtools", "infrastructure",
+    "saas", "enterprise", "b2b"
+)
+
+
+def _build_hint_automaton() -> ahocorasick.Automaton:
+    automaton = ahocorasick.Automaton()
+    for hint in INDUSTRY_HINTS:
+        automaton.add_word(hint, hint)
+    automaton.make_automaton()
+    return automaton
+
+
+# Finds every hint in one pass over a description instead of one scan per hint
+HINT_AUTOMATON = _build_hint_automaton()
+
 
 class DiscoveryExpander:
     """
@@ -38,22 +66,53 @@ class DiscoveryExpander:
 
     def __init__(self):
         self.generated_queries: List[str] = []
-        self.query_history_path = "data/query_history.json"
+        # Append-only, one query per line; last_run lives in a small side file
+        self.query_history_path = "data/query_history.txt"
+        self.query_meta_path = "data/query_history_meta.json"
+        self.legacy_history_path = "data/query_history.json"
         self._load_history()
 
     def _load_history(self):
-        """Load previously generated queries to avoid duplicates."""
+        """Load previously generated queries into a set to avoid duplicates."""
+        self._seen: Set[str] = set()
+        self.history = {"last_run": None}
+
         try:
             with open(self.query_history_path, "r") as f:
-                self.history = json.load(f)
+                self._seen.update(line.rstrip("\n") for line in f if line.strip())
+        except FileNotFoundError:
+            self._migrate_legacy_history()
+
+        try:
+            with open(self.query_meta_path, "r") as f:
+                self.history.update(json.load(f))
         except (FileNotFoundError, json.JSONDecodeError):
-            self.history = {"generated_queries": [], "last_run": None}
+            pass
 
-    def _save_history(self):
-        """Persist query history."""
+    def _migrate_legacy_history(self):
+        """One-time import of the old single-file JSON history."""
+        try:
+            with open(self.legacy_history_path, "r") as f:
+                legacy = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+
+        self._seen.update(legacy.get("generated_queries", []))
+        self._append_history(sorted(self._seen))
+        write_json_atomic(self.query_meta_path, {"last_run": legacy.get("last_run")})
+
+    def _append_history(self, queries: List[str]):
+        """Append queries to the history file without rewriting it."""
+        if not queries:
+            return
+        with open(self.query_history_path, "a") as f:
+            f.write("".join(f"{query}\n" for query in queries))
+
+    def _save_history(self, new_queries: List[str]):
+        """Persist newly generated queries and the run timestamp."""
+        self._append_history(new_queries)
         self.history["last_run"] = datetime.utcnow().isoformat()
-        with open(self.query_history_path, "w") as f:
-            json.dump(self.history, f, indent=2)
+        write_json_atomic(self.query_meta_path, self.history)
 
     def _extract_winning_keywords(self, session: Session) -> Set[str]:
         """
@@ -63,32 +122,24 @@ class DiscoveryExpander:
         """
         winning_keywords = set()
 
-        # Find contacts with positive replies
-        positive_replies = session.exec(
-            select(Reply).where(Reply.classification.in_(["interest", "referral"]))
+        # Profile columns of every company with a positive reply, in one joined query
+        companies = session.exec(
+            select(Company.signal_metadata, Company.industry, Company.description)
+            .join(Contact, Contact.company_id == Company.id)
+            .join(Reply, Reply.contact_id == Contact.id)
+            .where(Reply.classification.in_(["interest", "referral"]))
+            .distinct()
         ).all()
 
-        positive_contact_ids = {r.contact_id for r in positive_replies}
-        if not positive_contact_ids:
+        if not companies:
             logger.info("No positive replies yet — no expansion queries to generate.")
             return winning_keywords
 
-        # Get companies for those contacts
-        contacts = session.exec(
-            select(Contact).where(Contact.id.in_(positive_contact_ids))
-        ).all()
-
-        company_ids = {c.company_id for c in contacts}
-
-        for company_id in company_ids:
-            company = session.get(Company, company_id)
-            if not company:
-                continue
-
+        for signal_metadata, industry, description in companies:
             # Extract keywords from signal metadata
-            if company.signal_metadata:
+            if signal_metadata:
                 try:
-                    meta = json.loads(company.signal_metadata)
+                    meta = json.loads(signal_metadata)
                     breakdown = meta.get("score_breakdown", {})
                     for signal_key, signal_data in breakdown.items():
                         matches = signal_data.get("matches", [])
@@ -97,20 +148,14 @@ class DiscoveryExpander:
                     pass
 
             # Extract industry keywords
-            if company.industry:
-                winning_keywords.add(company.industry.lower())
+            if industry:
+                winning_keywords.add(industry.lower())
 
             # Extract from description
-            if company.description:
-                desc_lower = company.description.lower()
-                industry_hints = [
-                    "fintech", "healthcare", "legal", "insurance",
-                    "cybersecurity", "devtools", "infrastructure",
-                    "saas", "enterprise", "b2b"
-                ]
-                for hint in industry_hints:
-                    if hint in desc_lower:
-                        winning_keywords.add(hint)
+            if description:
+                winning_keywords.update(
+                    hint for _, hint in HINT_AUTOMATON.iter(description.lower())
+                )
 
         return winning_keywords
 
@@ -121,70 +166,60 @@ class DiscoveryExpander:
         """
         patterns = set()
 
-        # Get high-fit companies
-        companies = session.exec(
-            select(Company).where(Company.fitness_level == "high_priority")
+        # Count signal frequency across high-fit companies in one aggregate query
+        signal_count = func.count(CompanySignalLink.company_id)
+        top_signals = session.exec(
+            select(Signal.name, signal_count)
+            .join(CompanySignalLink, CompanySignalLink.signal_id == Signal.id)
+            .join(Company, Company.id == CompanySignalLink.company_id)
+            .where(Company.fitness_level == "high_priority")
+            .group_by(Signal.name)
+            .order_by(signal_count.desc(), Signal.name)
+            .limit(5)
         ).all()
 
-        if not companies:
-            return patterns
-
-        # Count signal frequency
-        signal_counts: Dict[str, int] = {}
-        for company in companies:
-            links = session.exec(
-                select(CompanySignalLink).where(
-                    CompanySignalLink.company_id == company.id
-                )
-            ).all()
-            for link in links:
-                signal = session.get(Signal, link.signal_id)
-                if signal:
-                    signal_counts[signal.name] = signal_counts.get(signal.name, 0) + 1
-
         # Top signals → keywords for expansion
-        sorted_signals = sorted(signal_counts.items(), key=lambda x: x[1], reverse=True)
-        for signal_name, count in sorted_signals[:5]:
+        for signal_name, count in top_signals:
             # Use signal name and description as query seeds
             patterns.add(signal_name.lower().replace("_", " "))
 
         return patterns
 
+    def _get_seed_keywords(self) -> Set[str]:
+        """Winning keywords plus high-signal patterns."""
+        with get_session() as session:
+            keywords = self._extract_winning_keywords(session)
+            patterns = self._extract_high_signal_patterns(session)
+        return keywords | patterns
+
     def generate_expansion_queries(self) -> List[str]:
         """
         Generate new search queries based on successful lead patterns.
         Returns list of new queries not previously used.
         """
-        with get_session() as session:
-            keywords = self._extract_winning_keywords(session)
-            patterns = self._extract_high_signal_patterns(session)
-            all_seeds = keywords | patterns
+        all_seeds = self._get_seed_keywords()
 
         if not all_seeds:
             logger.info("No seed keywords found for query expansion.")
             return []
 
-        # Generate queries from templates
-        new_queries = []
-        existing = set(self.history.get("generated_queries", []))
-
-        for seed in all_seeds:
-            # Skip very generic terms
-            if len(seed) < 3 or seed in {"api", "sdk", "sso", "the", "and", "for"}:
-                continue
+        existing = self._seen
 
-            for template in QUERY_TEMPLATES:
-                query = template.format(keyword=seed)
-                if query not in existing:
-                    new_queries.append(query)
-                    existing.add(query)
+        def _unseen_queries():
+            for seed in all_seeds:
+                # Skip very generic terms
+                if len(seed) < 3 or seed in GENERIC_SEEDS:
+                    continue
 
-        # Limit to avoid overwhelming the search engine
-        new_queries = new_queries[:25]
+                for template in QUERY_TEMPLATES:
+                    query = template.format(keyword=seed)
+                    if query not in existing:
+                        existing.add(query)
+                        yield query
 
-        # Save to history
-        self.history["generated_queries"] = list(existing)
-        self._save_history()
+        # Generate queries from templates, stopping once the limit is reached
+        new_queries = list(itertools.islice(_unseen_queries(), MAX_NEW_QUERIES))
+        self._save_history(new_queries)
 
         logger.info(f"Generated {len(new_queries)} new expansion queries from {len(all_seeds)} seed keywords.")
         self.generated_queries = new_queries
@@ -193,7 +228,7 @@ class DiscoveryExpander:
     def get_stats(self) -> Dict[str, Any]:
         """Get expansion stats."""
         return {
-            "total_queries_generated": len(self.history.get("generated_queries", [])),
+            "total_queries_generated": len(self._seen),
             "last_run": self.history.get("last_run"),
             "pending_queries": len(self.generated_queries),
         }
@@ -6,49 +6,196 @@ so that scoring weights can be refined based on what actually works.
 """
 
 import json
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
-from sqlmodel import select, func, Session
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+from sqlalchemy import bindparam
+from sqlmodel import select, func, case, Session
 from loguru import logger
 
 from src.storage.db import get_session
+from src.feedback.persistence import write_json_atomic
 from src.storage.models import (
     Company, Contact, Outreach, Reply,
     Signal, CompanySignalLink
 )
 
 
+TIERS = ["high_priority", "medium_priority", "disqualified"]
+
+# Running reply classification counts plus the Reply.id watermark they cover
+FEEDBACK_STATE_PATH = "data/feedback_state.json"
+# Bumped when older state can't be trusted; v2: reply ids became AUTOINCREMENT,
+# and counts kept before that may have missed replies that reused a deleted id
+FEEDBACK_STATE_VERSION = 2
+
+# Report statements are built once at import; each report run only executes them.
+
+# Per-contact outreach and reply aggregates. Joining these (one row per contact)
+# instead of the raw Outreach/Reply tables keeps the grouped queries below from
+# multiplying counts across each other.
+_OUTREACH_PER_CONTACT = (
+    select(
+        Outreach.contact_id,
+        func.sum(case((Outreach.status == "sent", 1), else_=0)).label("sent"),
+    )
+    .group_by(Outreach.contact_id)
+    .subquery()
+)
+_REPLIES_PER_CONTACT = (
+    select(
+        Reply.contact_id,
+        func.count(Reply.id).label("replied"),
+        func.sum(case((Reply.classification == "interest", 1), else_=0)).label("interest"),
+        func.sum(case((Reply.classification == "opt_out", 1), else_=0)).label("opt_out"),
+    )
+    .group_by(Reply.contact_id)
+    .subquery()
+)
+
+_OUTREACH_STATUS_COUNTS = (
+    select(Outreach.status, func.count(Outreach.id))
+    .where(Outreach.status.in_(["sent", "replied"]))
+    .group_by(Outreach.status)
+)
+# Replies are never reclassified and reply ids are AUTOINCREMENT (never reused),
+# so their counts can be maintained incrementally from the rows past the stored
+# watermark; deletions below it are caught by _REPLIES_UP_TO.
+_NEW_REPLY_CLASSIFICATION_COUNTS = (
+    select(Reply.classification, func.count(Reply.id), func.max(Reply.id))
+    .where(Reply.id > bindparam("last_reply_id"))
+    .group_by(Reply.classification)
+)
+_REPLIES_UP_TO = select(func.count(Reply.id)).where(Reply.id <= bindparam("last_reply_id"))
+
+# Cheap change marker for the report inputs: new or deleted replies, new outreach
+# rows, newly sent emails, new companies/contacts and (re)scoring, which rewrites
+# fitness levels and signal links, all move at least one of these values
+_OUTCOME_FINGERPRINT = select(
+    select(func.max(Reply.id)).scalar_subquery(),
+    select(func.count(Reply.id)).scalar_subquery(),
+    select(func.max(Outreach.id)).scalar_subquery(),
+    select(func.max(Outreach.sent_at)).scalar_subquery(),
+    select(func.max(Company.id)).scalar_subquery(),
+    select(func.max(Company.last_scored_at)).scalar_subquery(),
+    select(func.max(Contact.id)).scalar_subquery(),
+)
+
+# Signal metadata comes back as plain columns alongside the counts, so no
+# Signal ORM objects are built or touched per row
+_SIGNAL_PERFORMANCE = (
+    select(
+        Signal.name,
+        Signal.description,
+        Signal.category,
+        Signal.points,
+        func.count(func.distinct(CompanySignalLink.company_id)),
+        func.count(Contact.id),
+        func.coalesce(func.sum(_OUTREACH_PER_CONTACT.c.sent), 0),
+        func.coalesce(func.sum(_REPLIES_PER_CONTACT.c.replied), 0),
+        func.coalesce(func.sum(_REPLIES_PER_CONTACT.c.interest), 0),
+        func.coalesce(func.sum(_REPLIES_PER_CONTACT.c.opt_out), 0),
+    )
+    .join(CompanySignalLink, CompanySignalLink.signal_id == Signal.id)
+    .outerjoin(Contact, Contact.company_id == CompanySignalLink.company_id)
+    .outerjoin(_OUTREACH_PER_CONTACT, _OUTREACH_PER_CONTACT.c.contact_id == Contact.id)
+    .outerjoin(_REPLIES_PER_CONTACT, _REPLIES_PER_CONTACT.c.contact_id == Contact.id)
+    .group_by(Signal.id)
+    .order_by(Signal.id)
+)
+
+_TIER_PERFORMANCE = (
+    select(
+        Company.fitness_level,
+        func.count(func.distinct(Company.id)),
+        func.count(Contact.id),
+        func.coalesce(func.sum(_OUTREACH_PER_CONTACT.c.sent), 0),
+        func.coalesce(func.sum(_REPLIES_PER_CONTACT.c.replied), 0),
+        func.coalesce(func.sum(_REPLIES_PER_CONTACT.c.interest), 0),
+    )
+    .outerjoin(Contact, Contact.company_id == Company.id)
+    .outerjoin(_OUTREACH_PER_CONTACT, _OUTREACH_PER_CONTACT.c.contact_id == Contact.id)
+    .outerjoin(_REPLIES_PER_CONTACT, _REPLIES_PER_CONTACT.c.contact_id == Contact.id)
+    .where(Company.fitness_level.in_(TIERS))
+    .group_by(Company.fitness_level)
+)
+
+
 class OutcomeTracker:
     """
     Collects outreach outcomes and correlates them with ICP signals
     to identify which signals predict engagement.
     """
 
-    def __init__(self):
+    def __init__(self, state_path: str = FEEDBACK_STATE_PATH):
         self.metrics_cache = {}
+        # (fingerprint, report) of the last report, swapped as one value since the
+        # scheduler shares a tracker across job threads
+        self._fingerprinted_report: Optional[Tuple[tuple, Dict[str, Any]]] = None
+        self.state_path = state_path
+
+    def _load_state(self) -> Dict[str, Any]:
+        try:
+            with open(self.state_path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save_state(self, state: Dict[str, Any]):
+        try:
+            write_json_atomic(self.state_path, state)
+        except OSError as e:
+            logger.warning(f"Could not persist feedback state to {self.state_path}: {e}")
+
+    def _get_reply_classification_counts(self, session: Session) -> Dict[str, int]:
+        """
+        Reply counts per classification, merging only replies newer than the
+        persisted watermark into the stored totals.
+        """
+        state = self._load_state()
+        if state.get("version") != FEEDBACK_STATE_VERSION:
+            state = {}
+        dirty = not state
+        last_reply_id = state.get("last_reply_id", 0)
+        reply_rows = state.get("reply_rows", 0)
+        counts: Dict[str, int] = state.get("reply_counts", {})
+
+        # Replies at or below the watermark were deleted (e.g. a data deletion
+        # request) if their count moved; fall back to a full recount
+        if last_reply_id and session.execute(
+            _REPLIES_UP_TO, {"last_reply_id": last_reply_id}
+        ).scalar_one() != reply_rows:
+            last_reply_id, reply_rows, counts = 0, 0, {}
+            dirty = True
+
+        new_rows = session.execute(
+            _NEW_REPLY_CLASSIFICATION_COUNTS, {"last_reply_id": last_reply_id}
+        ).all()
+        for classification, count, max_id in new_rows:
+            counts[classification] = counts.get(classification, 0) + count
+            reply_rows += count
+            last_reply_id = max(last_reply_id, max_id)
+
+        if new_rows or dirty:
+            self._save_state({
+                "version": FEEDBACK_STATE_VERSION,
+                "last_reply_id": last_reply_id,
+                "reply_rows": reply_rows,
+                "reply_counts": counts,
+            })
+        return counts
 
     def _get_outreach_stats(self, session: Session) -> Dict[str, Any]:
         """Calculate global outreach statistics."""
 
-        total_sent = session.exec(
-            select(func.count(Outreach.id)).where(Outreach.status == "sent")
-        ).one()
-
-        total_replied = session.exec(
-            select(func.count(Outreach.id)).where(Outreach.status == "replied")
-        ).one()
-
-        total_interest = session.exec(
-            select(func.count(Reply.id)).where(Reply.classification == "interest")
-        ).one()
+        # One grouped count per table, dispatched by status/classification locally
+        by_status = dict(session.exec(_OUTREACH_STATUS_COUNTS).all())
+        by_classification = self._get_reply_classification_counts(session)
 
-        total_opt_out = session.exec(
-            select(func.count(Reply.id)).where(Reply.classification == "opt_out")
-        ).one()
-
-        total_deferral = session.exec(
-            select(func.count(Reply.id)).where(Reply.classification == "deferral")
-        ).one()
+        total_sent = by_status.get("sent", 0)
+        total_replied = by_status.get("replied", 0)
+        total_interest = by_classification.get("interest", 0)
+        total_opt_out = by_classification.get("opt_out", 0)
+        total_deferral = by_classification.get("deferral", 0)
 
         reply_rate = (total_replied / total_sent * 100) if total_sent > 0 else 0
         interest_rate = (total_interest / total_replied * 100) if total_replied > 0 else 0
@@ -72,71 +219,24 @@ class OutcomeTracker:
         This tells us which signals are predictive of engagement.
         """
         signal_perf = {}
+        # One grouped query for every signal instead of ~6 round-trips per signal
+        rows = session.exec(_SIGNAL_PERFORMANCE).all()
 
-        signals = session.exec(select(Signal)).all()
-
-        for signal in signals:
-            # Get all companies linked to this signal
-            links = session.exec(
-                select(CompanySignalLink).where(
-                    CompanySignalLink.signal_id == signal.id
-                )
-            ).all()
-
-            company_ids = [link.company_id for link in links]
-            if not company_ids:
-                continue
-
-            # Get contacts in those companies
-            contacts = session.exec(
-                select(Contact).where(Contact.company_id.in_(company_ids))
-            ).all()
-            contact_ids = [c.id for c in contacts]
-
-            if not contact_ids:
+        for (name, description, category, points, company_count, contact_count,
+             sent_count, replied_count, interest_count, opt_out_count) in rows:
+            if not contact_count:
                 continue
 
-            # Count outreach sent to those contacts
-            sent_count = session.exec(
-                select(func.count(Outreach.id)).where(
-                    Outreach.contact_id.in_(contact_ids),
-                    Outreach.status == "sent"
-                )
-            ).one()
-
-            # Count replies
-            replied_count = session.exec(
-                select(func.count(Reply.id)).where(
-                    Reply.contact_id.in_(contact_ids)
-                )
-            ).one()
-
-            # Count interest replies
-            interest_count = session.exec(
-                select(func.count(Reply.id)).where(
-                    Reply.contact_id.in_(contact_ids),
-                    Reply.classification == "interest"
-                )
-            ).one()
-
-            # Count opt-out replies
-            opt_out_count = session.exec(
-                select(func.count(Reply.id)).where(
-                    Reply.contact_id.in_(contact_ids),
-                    Reply.classification == "opt_out"
-                )
-            ).one()
-
             reply_rate = (replied_count / sent_count * 100) if sent_count > 0 else 0
             interest_rate = (interest_count / replied_count * 100) if replied_count > 0 else 0
             opt_out_rate = (opt_out_count / sent_count * 100) if sent_count > 0 else 0
 
-            signal_perf[signal.name] = {
-                "signal_description": signal.description,
-                "category": signal.category,
-                "current_points": signal.points,
-                "companies_with_signal": len(company_ids),
-                "contacts_reached": len(contact_ids),
+            signal_perf[name] = {
+                "signal_description": description,
+                "category": category,
+                "current_points": points,
+                "companies_with_signal": company_count,
+                "contacts_reached": contact_count,
                 "emails_sent": sent_count,
                 "replies": replied_count,
                 "interests": interest_count,
@@ -152,56 +252,21 @@ class OutcomeTracker:
         """
         Calculate outreach performance per fitness tier (high_priority, medium_priority, disqualified).
         """
-        tier_perf = {}
-
-        for tier in ["high_priority", "medium_priority", "disqualified"]:
-            companies = session.exec(
-                select(Company).where(Company.fitness_level == tier)
-            ).all()
-            company_ids = [c.id for c in companies]
-
-            if not company_ids:
-                tier_perf[tier] = {
-                    "companies": 0, "contacts": 0, "sent": 0,
-                    "replied": 0, "interest": 0, "reply_rate_pct": 0
-                }
-                continue
-
-            contacts = session.exec(
-                select(Contact).where(Contact.company_id.in_(company_ids))
-            ).all()
-            contact_ids = [c.id for c in contacts]
-
-            sent = 0
-            replied = 0
-            interest = 0
-
-            if contact_ids:
-                sent = session.exec(
-                    select(func.count(Outreach.id)).where(
-                        Outreach.contact_id.in_(contact_ids),
-                        Outreach.status == "sent"
-                    )
-                ).one()
-
-                replied = session.exec(
-                    select(func.count(Reply.id)).where(
-                        Reply.contact_id.in_(contact_ids)
-                    )
-                ).one()
-
-                interest = session.exec(
-                    select(func.count(Reply.id)).where(
-                        Reply.contact_id.in_(contact_ids),
-                        Reply.classification == "interest"
-                    )
-                ).one()
+        tier_perf = {
+            tier: {
+                "companies": 0, "contacts": 0, "sent": 0,
+                "replied": 0, "interest": 0, "reply_rate_pct": 0
+            }
+            for tier in TIERS
+        }
+        rows = session.exec(_TIER_PERFORMANCE).all()
 
+        for tier, company_count, contact_count, sent, replied, interest in rows:
             reply_rate = (replied / sent * 100) if sent > 0 else 0
 
             tier_perf[tier] = {
-                "companies": len(company_ids),
-                "contacts": len(contact_ids),
+                "companies": company_count,
+                "contacts": contact_count,
                 "sent": sent,
                 "replied": replied,
                 "interest": interest,
@@ -211,8 +276,16 @@ class OutcomeTracker:
         return tier_perf
 
     def generate_report(self) -> Dict[str, Any]:
-        """Generate a full outcome report with all metrics."""
+        """
+        Generate a full outcome report with all metrics. The previous report is
+        reused for as long as none of its inputs have changed (see _OUTCOME_FINGERPRINT).
+        """
         with get_session() as session:
+            fingerprint = tuple(session.exec(_OUTCOME_FINGERPRINT).one())
+            cached = self._fingerprinted_report
+            if cached is not None and cached[0] == fingerprint:
+                return cached[1]
+
             report = {
                 "generated_at": datetime.utcnow().isoformat(),
                 "global_stats": self._get_outreach_stats(session),
@@ -221,6 +294,7 @@ class OutcomeTracker:
             }
 
         self.metrics_cache = report
+        self._fingerprinted_report = (fingerprint, report)
         return report
 
     def log_report(self):
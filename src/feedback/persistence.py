@@ -0,0 +1,34 @@
+"""
+Persistence helpers shared by the feedback modules.
+
+JSON state and report files are written to a temp file in the same directory
+and swapped in with os.replace, so a crash mid-write never leaves a truncated
+file behind for the next run to choke on.
+"""
+
+import os
+import tempfile
+import orjson
+
+
+def write_json_atomic(path: str, data, indent: bool = False):
+    """Serialize data with orjson and atomically replace the file at path."""
+    option = orjson.OPT_INDENT_2 if indent else 0
+    path = os.fspath(path)
+    # Unique temp file per call, so concurrent writers (scheduler threads) never share one
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(orjson.dumps(data, option=option))
+        # mkstemp creates the file 0600; keep the permissions of the file being replaced
+        try:
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o777)
+        except FileNotFoundError:
+            os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -10,19 +10,24 @@ Provides a unified dashboard view of:
 - System health alerts
 """
 
-import json
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
-from sqlmodel import select, func, Session
+from sqlmodel import select, func, case, Session
 from loguru import logger
 
 from src.storage.db import get_session
+from src.feedback.persistence import write_json_atomic
 from src.storage.models import (
     Company, Contact, Outreach, Reply,
     TaskLog, SuppressionList
 )
 
 
+def _count_where(condition):
+    """COUNT of rows matching condition, as a column usable alongside other aggregates."""
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
 class PipelineHealthMonitor:
     """
     Monitors pipeline health metrics and generates reports/alerts.
@@ -33,51 +38,39 @@ class PipelineHealthMonitor:
 
     def _get_pipeline_counts(self, session: Session) -> Dict[str, int]:
         """Count leads at each pipeline stage."""
-        total_companies = session.exec(select(func.count(Company.id))).one()
-        scraped = session.exec(
-            select(func.count(Company.id)).where(Company.is_scraped == True)
-        ).one()
-        scored = session.exec(
-            select(func.count(Company.id)).where(Company.is_scored == True)
-        ).one()
-        high_fit = session.exec(
-            select(func.count(Company.id)).where(Company.fitness_level == "high_priority")
-        ).one()
-        medium_fit = session.exec(
-            select(func.count(Company.id)).where(Company.fitness_level == "medium_priority")
-        ).one()
-        disqualified = session.exec(
-            select(func.count(Company.id)).where(Company.fitness_level == "disqualified")
-        ).one()
-
-        total_contacts = session.exec(select(func.count(Contact.id))).one()
-        verified_contacts = session.exec(
-            select(func.count(Contact.id)).where(Contact.is_verified == True)
+        # One statement per table; each bucket is a conditional SUM over the same scan
+        (total_companies, scraped, scored,
+         high_fit, medium_fit, disqualified) = session.exec(
+            select(
+                func.count(Company.id),
+                _count_where(Company.is_scraped == True),
+                _count_where(Company.is_scored == True),
+                _count_where(Company.fitness_level == "high_priority"),
+                _count_where(Company.fitness_level == "medium_priority"),
+                _count_where(Company.fitness_level == "disqualified"),
+            )
         ).one()
 
-        active_outreach = session.exec(
-            select(func.count(Contact.id)).where(Contact.outreach_status == "active")
-        ).one()
-        pending_outreach = session.exec(
-            select(func.count(Contact.id)).where(Contact.outreach_status == "pending")
-        ).one()
-        total_replied = session.exec(
-            select(func.count(Contact.id)).where(
-                Contact.outreach_status.in_(["replied", "active_lead", "deferred", "referral_needed"])
+        (total_contacts, verified_contacts, active_outreach, pending_outreach,
+         total_replied, active_leads, opted_out) = session.exec(
+            select(
+                func.count(Contact.id),
+                _count_where(Contact.is_verified == True),
+                _count_where(Contact.outreach_status == "active"),
+                _count_where(Contact.outreach_status == "pending"),
+                _count_where(Contact.outreach_status.in_(
+                    ["replied", "active_lead", "deferred", "referral_needed"]
+                )),
+                _count_where(Contact.outreach_status == "active_lead"),
+                _count_where(Contact.outreach_status == "opt_out"),
             )
         ).one()
-        active_leads = session.exec(
-            select(func.count(Contact.id)).where(Contact.outreach_status == "active_lead")
-        ).one()
-        opted_out = session.exec(
-            select(func.count(Contact.id)).where(Contact.outreach_status == "opt_out")
-        ).one()
 
-        total_emails_sent = session.exec(
-            select(func.count(Outreach.id)).where(Outreach.status == "sent")
-        ).one()
-        total_drafts = session.exec(
-            select(func.count(Outreach.id)).where(Outreach.status == "draft")
+        total_emails_sent, total_drafts = session.exec(
+            select(
+                _count_where(Outreach.status == "sent"),
+                _count_where(Outreach.status == "draft"),
+            )
         ).one()
 
         suppressed = session.exec(select(func.count(SuppressionList.id))).one()
@@ -209,14 +202,17 @@ class PipelineHealthMonitor:
         """Get activity counts from the last N hours."""
         cutoff = datetime.utcnow() - timedelta(hours=hours)
 
-        recent_tasks = session.exec(
-            select(TaskLog).where(TaskLog.created_at >= cutoff)
+        # Grouped in SQL: one row per (task, status) instead of every recent log row
+        rows = session.exec(
+            select(TaskLog.task_name, TaskLog.status, func.count(TaskLog.id))
+            .where(TaskLog.created_at >= cutoff)
+            .group_by(TaskLog.task_name, TaskLog.status)
         ).all()
 
         task_counts: Dict[str, int] = {}
-        for task in recent_tasks:
-            key = f"{task.task_name}_{task.status}"
-            task_counts[key] = task_counts.get(key, 0) + 1
+        for task_name, status, count in rows:
+            key = f"{task_name}_{status}"
+            task_counts[key] = task_counts.get(key, 0) + count
 
         return task_counts
 
@@ -287,8 +283,7 @@ class PipelineHealthMonitor:
         if report is None:
             report = self.generate_health_report()
 
-        with open(path, "w") as f:
-            json.dump(report, f, indent=2)
+        write_json_atomic(path, report, indent=True)
         logger.info(f"Pipeline health report saved to {path}")
 
 
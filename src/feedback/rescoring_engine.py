@@ -7,10 +7,12 @@ Handles two scenarios:
 3. Periodic full re-score to catch companies near tier boundaries
 """
 
-import json
+import hashlib
+import os
+import orjson
 from datetime import datetime, timedelta
 from typing import List
-from sqlmodel import select, Session
+from sqlmodel import select, or_, Session
 from loguru import logger
 
 from src.storage.db import get_session
@@ -27,25 +29,37 @@ class RescoringEngine:
     def __init__(self, config_path: str = "scoring_config.json"):
         self.config_path = config_path
         self._last_config_hash = None
+        self._last_mtime_ns = None
         self._load_config_hash()
 
     def _load_config_hash(self):
         """Compute a hash of the current scoring config for change detection."""
         try:
-            with open(self.config_path, "r") as f:
-                config = json.load(f)
+            # Stat before reading so a write racing the read is seen on the next check
+            self._last_mtime_ns = os.stat(self.config_path).st_mtime_ns
+            with open(self.config_path, "rb") as f:
+                config = orjson.loads(f.read())
 
-            # Hash based on signal points and thresholds only
+            # Hash based on signal points and thresholds only. blake2b is stable across
+            # processes, unlike the per-process salted built-in hash().
             signals = config.get("signals", {})
             thresholds = config.get("thresholds", {})
-            hash_input = json.dumps({"signals": signals, "thresholds": thresholds}, sort_keys=True)
-            self._last_config_hash = hash(hash_input)
+            hash_input = orjson.dumps({"signals": signals, "thresholds": thresholds}, option=orjson.OPT_SORT_KEYS)
+            self._last_config_hash = hashlib.blake2b(hash_input, digest_size=16).digest()
         except Exception as e:
             logger.error(f"Error loading config for hash: {e}")
             self._last_config_hash = None
+            self._last_mtime_ns = None
 
     def _config_changed(self) -> bool:
         """Check if scoring config has been modified since last check."""
+        # An untouched file can't have changed; skip the read, parse and hash
+        try:
+            if os.stat(self.config_path).st_mtime_ns == self._last_mtime_ns:
+                return False
+        except OSError:
+            pass
+
         old_hash = self._last_config_hash
         self._load_config_hash()
         return old_hash is not None and old_hash != self._last_config_hash
@@ -64,13 +78,11 @@ class RescoringEngine:
                 logger.info("No companies to re-score.")
                 return 0
 
-            changed_count = 0
-            for company in companies:
-                old_score = company.fitness_score
-                old_tier = company.fitness_level
-
-                detector.process_company(session, company)
+            previous = [(company.fitness_level, company.fitness_score) for company in companies]
+            detector.process_batch(session, companies)
 
+            changed_count = 0
+            for company, (old_tier, old_score) in zip(companies, previous):
                 if company.fitness_score != old_score or company.fitness_level != old_tier:
                     changed_count += 1
                     logger.info(
@@ -103,42 +115,25 @@ class RescoringEngine:
         detector = AgentSignalDetector(config_path=self.config_path)
 
         with get_session() as session:
-            companies = session.exec(
+            stale_companies = session.exec(
                 select(Company).where(
                     Company.is_scraped == True,
-                    Company.is_scored == True
+                    Company.is_scored == True,
+                    or_(Company.last_scored_at == None, Company.last_scored_at < cutoff)
                 )
             ).all()
 
-            stale_companies = []
-            for company in companies:
-                # Check last scored time from metadata
-                if company.signal_metadata:
-                    try:
-                        meta = json.loads(company.signal_metadata)
-                        last_scored = meta.get("last_scored")
-                        if last_scored:
-                            scored_dt = datetime.fromisoformat(last_scored)
-                            if scored_dt < cutoff:
-                                stale_companies.append(company)
-                        else:
-                            stale_companies.append(company)
-                    except (json.JSONDecodeError, ValueError):
-                        stale_companies.append(company)
-                else:
-                    stale_companies.append(company)
-
             if not stale_companies:
                 logger.info(f"No companies stale (>{days_threshold} days). Skipping re-score.")
                 return 0
 
             logger.info(f"Found {len(stale_companies)} stale companies to re-score.")
-            changed = 0
-            for company in stale_companies:
-                old_tier = company.fitness_level
-                detector.process_company(session, company)
-                if company.fitness_level != old_tier:
-                    changed += 1
+            old_tiers = [company.fitness_level for company in stale_companies]
+            detector.process_batch(session, stale_companies)
+            changed = sum(
+                company.fitness_level != old_tier
+                for company, old_tier in zip(stale_companies, old_tiers)
+            )
 
             session.commit()
             logger.success(f"Re-scored {len(stale_companies)} stale companies. {changed} tier changes.")
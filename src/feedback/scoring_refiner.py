@@ -10,13 +10,13 @@ Uses the Outcome Tracker's signal-level performance data to:
 
 import json
 import shutil
-import math
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, Optional, Tuple
 from loguru import logger
 
 from src.feedback.outcome_tracker import OutcomeTracker
+from src.feedback.persistence import write_json_atomic
 
 
 # Minimum sample size required before adjusting a signal's weight
@@ -25,12 +25,22 @@ MIN_SAMPLE_SIZE = 10
 # Maximum allowed change per refinement cycle (prevents wild swings)
 MAX_POINT_DELTA = 2
 
+# Strong performers gain about log2(ratio) points, clamped to 1..MAX_POINT_DELTA;
+# entry i is the ratio at which the gain steps up to i + 2 (2 ** 1.5 ≈ 2.83 for 2)
+STRONG_PERFORMER_RATIOS = tuple(2 ** (step + 0.5) for step in range(1, MAX_POINT_DELTA))
+
 # Baseline expected reply rate (used as reference)
 BASELINE_REPLY_RATE = 5.0  # percent
 
 # Weight decay factor for signals with no engagement data
 DECAY_FACTOR = 0.95
 
+# Skip a backup if the newest one is of a config written less than this long ago
+BACKUP_DEBOUNCE_SECONDS = 600
+
+# Number of config backups kept (matches the refinement_history cap)
+BACKUP_RETENTION = 20
+
 
 class ScoringRefiner:
     """
@@ -38,28 +48,47 @@ class ScoringRefiner:
     updated scoring_config.json with a backup trail.
     """
 
-    def __init__(self, config_path: str = "scoring_config.json", backup_dir: str = "data/config_history"):
+    def __init__(self, config_path: str = "scoring_config.json", backup_dir: str = "data/config_history",
+                 tracker: Optional[OutcomeTracker] = None):
         self.config_path = Path(config_path)
         self.backup_dir = Path(backup_dir)
         self.backup_dir.mkdir(parents=True, exist_ok=True)
-        self.tracker = OutcomeTracker()
+        self.tracker = tracker or OutcomeTracker()
 
     def _load_config(self) -> Dict[str, Any]:
         """Load the current scoring config."""
         with open(self.config_path, "r") as f:
             return json.load(f)
 
-    def _save_config(self, config: Dict[str, Any]):
-        """Save scoring config with a timestamped backup."""
-        # Create backup
+    def _backup_config(self):
+        """
+        Back up the current config into backup_dir, debounced: back-to-back refines
+        share one backup. copy2 keeps the source mtime, so the newest backup's
+        mtime is when the config it holds was written.
+        """
+        backups = sorted(self.backup_dir.glob("scoring_config_*.json"))
+        config_mtime = self.config_path.stat().st_mtime
+        last_backup_mtime = max((p.stat().st_mtime for p in backups), default=0)
+        if config_mtime - last_backup_mtime < BACKUP_DEBOUNCE_SECONDS:
+            logger.debug("Recent config backup exists, skipping backup.")
+            return
+
         timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
         backup_path = self.backup_dir / f"scoring_config_{timestamp}.json"
         shutil.copy2(self.config_path, backup_path)
         logger.info(f"Backed up config to {backup_path}")
 
-        # Write updated config
-        with open(self.config_path, "w") as f:
-            json.dump(config, f, indent=2)
+        # Timestamped names sort chronologically; drop all but the newest
+        backups.append(backup_path)
+        for old_backup in backups[:-BACKUP_RETENTION]:
+            old_backup.unlink(missing_ok=True)
+
+    def _save_config(self, config: Dict[str, Any]):
+        """Save scoring config with a timestamped backup."""
+        self._backup_config()
+
+        # Write updated config (atomically, so a crash never truncates it)
+        write_json_atomic(self.config_path, config, indent=True)
         logger.info(f"Saved updated scoring config to {self.config_path}")
 
     def _calculate_adjustment(self, signal_data: Dict[str, Any], global_reply_rate: float) -> Tuple[int, str]:
@@ -95,7 +124,7 @@ class ScoringRefiner:
 
         # === Reply rate significantly above average → increase ===
         if performance_ratio >= 1.5 and interest_rate > 30:
-            delta = min(MAX_POINT_DELTA, max(1, round(math.log2(performance_ratio))))
+            delta = 1 + sum(performance_ratio >= ratio for ratio in STRONG_PERFORMER_RATIOS)
             return delta, f"Strong performer: {reply_rate}% reply rate ({performance_ratio:.1f}x reference), {interest_rate}% interest"
 
         if performance_ratio >= 1.2:
@@ -177,37 +206,48 @@ class ScoringRefiner:
         changes = []
         signals_config = config.get("signals", {})
 
-        for category, signals in signals_config.items():
-            for signal_key, details in signals.items():
-                perf_data = signal_perf.get(signal_key, {})
-
-                if not perf_data:
-                    # No outreach data for this signal yet
-                    continue
-
-                delta, reason = self._calculate_adjustment(perf_data, global_reply_rate)
-
-                if delta != 0:
-                    old_points = details.get("points", 0)
-                    new_points = max(1, old_points + delta)  # Minimum 1 point
-
-                    change_record = {
-                        "signal": signal_key,
-                        "category": category,
-                        "old_points": old_points,
-                        "new_points": new_points,
-                        "delta": delta,
-                        "reason": reason,
-                    }
-                    changes.append(change_record)
-
-                    if not dry_run:
-                        details["points"] = new_points
+        signal_index = {
+            signal_key: (category, details)
+            for category, signals in signals_config.items()
+            for signal_key, details in signals.items()
+        }
 
-                    logger.info(
-                        f"{'[DRY RUN] ' if dry_run else ''}"
-                        f"Signal {signal_key}: {old_points} → {new_points} pts ({'+' if delta > 0 else ''}{delta}) — {reason}"
-                    )
+        # Only signals with enough outreach data can be adjusted
+        candidates = (
+            (signal_key, perf_data) for signal_key, perf_data in signal_perf.items()
+            if perf_data.get("emails_sent", 0) >= MIN_SAMPLE_SIZE
+        )
+
+        for signal_key, perf_data in candidates:
+            entry = signal_index.get(signal_key)
+            if not entry:
+                # Signal no longer in the config
+                continue
+            category, details = entry
+
+            delta, reason = self._calculate_adjustment(perf_data, global_reply_rate)
+
+            if delta != 0:
+                old_points = details.get("points", 0)
+                new_points = max(1, old_points + delta)  # Minimum 1 point
+
+                change_record = {
+                    "signal": signal_key,
+                    "category": category,
+                    "old_points": old_points,
+                    "new_points": new_points,
+                    "delta": delta,
+                    "reason": reason,
+                }
+                changes.append(change_record)
+
+                if not dry_run:
+                    details["points"] = new_points
+
+                logger.info(
+                    f"{'[DRY RUN] ' if dry_run else ''}"
+                    f"Signal {signal_key}: {old_points} → {new_points} pts ({'+' if delta > 0 else ''}{delta}) — {reason}"
+                )
 
         # Adjust thresholds
         threshold_changed = False
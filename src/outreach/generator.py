@@ -1,12 +1,12 @@
 
-import json
 import os
+import orjson
 import smtplib
 import ssl
 from email.message import EmailMessage
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
-from sqlmodel import select, Session, desc
+from typing import List, Dict, Any, Optional, Tuple
+from sqlmodel import select, func, Session, desc
 from loguru import logger
 from dotenv import load_dotenv
 
@@ -20,6 +20,13 @@ from src.compliance.suppression import SuppressionManager
 # Configuration
 SEQUENCE_GAP_DAYS = 3
 
+# Contacts in these states have left the sequence and are not processed
+EXIT_STATUSES = ["completed", "replied", "bounced", "opt_out", "suppressed"]
+
+# Parsed context_analysis per company id, reused while its signal_metadata is unchanged
+CONTEXT_CACHE_MAX_SIZE = 4096
+_context_cache: Dict[int, Tuple[str, Dict[str, Any]]] = {}
+
 class OutreachManager:
     """
     Manages the outreach lifecycle: generating initial drafts, scheduling follow-ups,
@@ -35,17 +42,35 @@ class OutreachManager:
         self.email_from = os.getenv("EMAIL_FROM", self.smtp_user)
 
     def _get_context(self, company: Company) -> Dict[str, Any]:
-        """Attributes the context dictionary from company metadata."""
+        """
+        Attributes the context dictionary from company metadata. The metadata is
+        parsed once per company and version; callers get their own copy to mutate.
+        """
         if not company.signal_metadata:
             return {}
+
+        cached = _context_cache.get(company.id)
+        if cached is not None and cached[0] == company.signal_metadata:
+            return dict(cached[1])
+
         try:
-            meta = json.loads(company.signal_metadata)
-            return meta.get("context_analysis", {})
-        except json.JSONDecodeError:
+            context = orjson.loads(company.signal_metadata).get("context_analysis", {})
+        except orjson.JSONDecodeError:
             return {}
 
-    def _generate_draft(self, session: Session, contact: Contact, company: Company, stage: int):
-        """Generates an email draft for a specific stage."""
+        if len(_context_cache) >= CONTEXT_CACHE_MAX_SIZE:
+            # Drop the oldest entry (dicts keep insertion order)
+            _context_cache.pop(next(iter(_context_cache)))
+        _context_cache[company.id] = (company.signal_metadata, context)
+        return dict(context)
+
+    def _generate_draft(self, session: Session, contact: Contact, company: Company, stage: int,
+                        new_outreaches: Optional[List[Dict[str, Any]]] = None):
+        """
+        Generates an email draft for a specific stage.
+        With `new_outreaches` the Outreach row is appended to it as a mapping for the
+        caller to bulk-insert; otherwise it is added to the session directly.
+        """
         context = self._get_context(company)
         # Add company name to context for template filling
         context["company_name"] = company.name
@@ -63,14 +88,17 @@ class OutreachManager:
             content = template.align_content(context, contact_dict)
             
             # Create Outreach record
-            outreach = Outreach(
-                contact_id=contact.id,
-                template_id=template.id,
-                stage=stage,
-                status="draft",
-                content=json.dumps(content) 
-            )
-            session.add(outreach)
+            outreach = {
+                "contact_id": contact.id,
+                "template_id": template.id,
+                "stage": stage,
+                "status": "draft",
+                "content": orjson.dumps(content).decode()
+            }
+            if new_outreaches is not None:
+                new_outreaches.append(outreach)
+            else:
+                session.add(Outreach(**outreach))
             
             # Update Contact state
             contact.outreach_stage = stage
@@ -83,11 +111,42 @@ class OutreachManager:
         except Exception as e:
             logger.error(f"Failed to generate email for {contact.email}: {e}")
 
-    def process_contact(self, session: Session, contact: Contact, company: Company):
-        """Decides the next action for a single contact."""
+    def _latest_outreach_by_contact(self, session: Session) -> Dict[int, Outreach]:
+        """
+        Most recent Outreach row for every contact still in a sequence, fetched
+        in one query (MAX(id) per contact joined back to outreach).
+        """
+        latest_ids = (
+            select(func.max(Outreach.id).label("id"))
+            .group_by(Outreach.contact_id)
+            .subquery()
+        )
+        rows = session.exec(
+            select(Outreach)
+            .join(latest_ids, latest_ids.c.id == Outreach.id)
+            .join(Contact, Contact.id == Outreach.contact_id)
+            .where(Contact.outreach_status.notin_(EXIT_STATUSES))
+        ).all()
+        return {outreach.contact_id: outreach for outreach in rows}
+
+    def process_contact(self, session: Session, contact: Contact, company: Company,
+                        suppressed: Optional[set] = None,
+                        latest_outreach: Optional[Dict[int, Outreach]] = None,
+                        new_outreaches: Optional[List[Dict[str, Any]]] = None):
+        """
+        Decides the next action for a single contact.
+        `suppressed` is an optional pre-fetched set from filter_suppressed, and
+        `latest_outreach` an optional pre-fetched {contact_id: last Outreach} map;
+        without them the suppression list / outreach table is queried for this contact.
+        New drafts are collected in `new_outreaches` when given (see _generate_draft).
+        """
         
         # 0. COMPLIANCE GATE: Check suppression list before any action
-        if contact.email and self.suppression_manager.is_suppressed(session, contact.email):
+        if suppressed is not None:
+            is_suppressed = contact.email in suppressed
+        else:
+            is_suppressed = bool(contact.email) and self.suppression_manager.is_suppressed(session, contact.email)
+        if contact.email and is_suppressed:
             if contact.outreach_status not in ["suppressed", "opt_out"]:
                 contact.outreach_status = "suppressed"
                 session.add(contact)
@@ -96,7 +155,10 @@ class OutreachManager:
 
         # 1. Check for Reply
         # If any outreach has status 'replied', update contact and stop.
-        last_outreach = session.exec(select(Outreach).where(Outreach.contact_id == contact.id).order_by(desc(Outreach.id))).first()
+        if latest_outreach is not None:
+            last_outreach = latest_outreach.get(contact.id)
+        else:
+            last_outreach = session.exec(select(Outreach).where(Outreach.contact_id == contact.id).order_by(desc(Outreach.id))).first()
         
         if last_outreach and last_outreach.status == "replied":
             # If already classified (e.g. active_lead, opt_out), don't overwrite with generic 'replied'
@@ -113,7 +175,7 @@ class OutreachManager:
             if contact.email: # Verify email exists
                 logger.info(f"Starting sequence for {contact.email}...")
                 contact.outreach_status = "active"
-                self._generate_draft(session, contact, company, 1)
+                self._generate_draft(session, contact, company, 1, new_outreaches)
                 session.add(contact)
             return
 
@@ -121,7 +183,7 @@ class OutreachManager:
         if contact.outreach_status == "active":
             if not last_outreach:
                 # Should not happen if active, but fail safe to Stage 1
-                self._generate_draft(session, contact, company, 1)
+                self._generate_draft(session, contact, company, 1, new_outreaches)
                 return
 
             # Check if pending draft exists
@@ -148,7 +210,7 @@ class OutreachManager:
                 if delta.days >= SEQUENCE_GAP_DAYS:
                     next_stage = last_outreach.stage + 1
                     logger.info(f"Gap requirement met ({delta.days} days). Advancing {contact.email} to Stage {next_stage}.")
-                    self._generate_draft(session, contact, company, next_stage)
+                    self._generate_draft(session, contact, company, next_stage, new_outreaches)
                 else:
                     # Still waiting in gap
                     pass
@@ -199,7 +261,7 @@ class OutreachManager:
                     continue
 
                 try:
-                    content = json.loads(outreach.content)
+                    content = orjson.loads(outreach.content)
                     subject = content.get("subject")
                     body = content.get("body")
 
@@ -224,26 +286,44 @@ class OutreachManager:
         """Main execution loop."""
         with get_session() as session:
             # 1. Generate new drafts
-            statement = select(Company).where(Company.is_scored == True)
-            companies = session.exec(statement).all()
+            # Only contacts still in a sequence are loaded, each alongside its company
+            statement = (
+                select(Contact, Company)
+                .join(Company, Contact.company_id == Company.id)
+                .where(Company.is_scored == True)
+                .where(Contact.outreach_status.notin_(EXIT_STATUSES))
+                .order_by(Company.id, Contact.id)
+            )
+            rows = session.exec(statement).all()
             
-            count = 0
-            for company in companies:
-                # SMB SIZE FILTER (Step 5)
+            # SMB SIZE FILTER (Step 5)
+            eligible = []
+            oversized = set()
+            for contact, company in rows:
                 if company.employee_count and company.employee_count > 500:
-                    logger.info(f"Skipping {company.domain} - Employee count {company.employee_count} exceeds SMB threshold (500)")
+                    if company.id not in oversized:
+                        oversized.add(company.id)
+                        logger.info(f"Skipping {company.domain} - Employee count {company.employee_count} exceeds SMB threshold (500)")
                     continue
+                eligible.append((contact, company))
 
-                if not company.contacts:
-                    continue
-                    
-                for contact in company.contacts:
-                    if contact.outreach_status in ["completed", "replied", "bounced", "opt_out", "suppressed"]:
-                        continue
-                    
-                    self.process_contact(session, contact, company)
-                    count += 1
+            # Warm the suppression gate with one batched lookup instead of one query per contact
+            suppressed = self.suppression_manager.filter_suppressed(
+                session, [contact.email for contact, _ in eligible if contact.email]
+            )
+
+            # Likewise fetch every contact's latest outreach row up front
+            latest_outreach = self._latest_outreach_by_contact(session)
+
+            # Drafts are inserted together after the loop rather than one INSERT each
+            new_outreaches: List[Dict[str, Any]] = []
+            count = 0
+            for contact, company in eligible:
+                self.process_contact(session, contact, company, suppressed, latest_outreach, new_outreaches)
+                count += 1
             
+            if new_outreaches:
+                session.bulk_insert_mappings(Outreach, new_outreaches)
             session.commit()
             logger.info(f"Processed outreach sequence logic for {count} contacts.")
         
@@ -2,7 +2,7 @@
 import os
 import imap_tools
 from imap_tools import MailBox, AND
-from sqlmodel import select
+from sqlmodel import select, func, update
 from loguru import logger
 from datetime import datetime
 from openai import OpenAI
@@ -135,12 +135,18 @@ class InboxMonitor:
                         )
                         session.add(reply)
                         
-                        # Update last Outreach record to 'replied'
-                        last_outreach = session.exec(select(Outreach).where(Outreach.contact_id == contact.id).order_by(Outreach.id.desc())).first()
-                        if last_outreach:
-                            last_outreach.status = "replied"
-                            last_outreach.reply_received_at = msg.date
-                            session.add(last_outreach)
+                        # Update last Outreach record to 'replied' (in SQL, without loading the row)
+                        last_outreach_id = (
+                            select(func.max(Outreach.id))
+                            .where(Outreach.contact_id == contact.id)
+                            .scalar_subquery()
+                        )
+                        session.exec(
+                            update(Outreach)
+                            .where(Outreach.id == last_outreach_id)
+                            .values(status="replied", reply_received_at=msg.date)
+                            .execution_options(synchronize_session=False)
+                        )
                         
                         # Update Contact status based on classification
                         if category == "interest":
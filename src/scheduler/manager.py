@@ -1,19 +1,40 @@
+import random
+from datetime import datetime, timedelta
+
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.jobstores.memory import MemoryJobStore
 from apscheduler.triggers.interval import IntervalTrigger
 from loguru import logger
 import time
 
+# Never run two copies of the same job, and collapse a backlog of missed
+# runs into a single run instead of firing them all at once.
+JOB_DEFAULTS = {
+    "max_instances": 1,
+    "coalesce": True,
+    "misfire_grace_time": 60,
+}
+
+# Random spread (seconds) applied to every fire time
+JOB_JITTER_SECONDS = 30
+
 class TaskScheduler:
     def __init__(self):
-        self.scheduler = BackgroundScheduler()
+        self.scheduler = BackgroundScheduler(
+            jobstores={"default": MemoryJobStore()},
+            job_defaults=JOB_DEFAULTS,
+        )
         self.is_running = False
 
     def add_job(self, func, interval_minutes, job_id, **kwargs):
         """Add a recurring job to the scheduler."""
-        logger.info(f"Adding job: {job_id} with interval {interval_minutes}m")
+        # Stagger the first run within the interval so jobs with aligned
+        # intervals (30m/60m/120m...) don't all hit the database together.
+        start_date = datetime.now() + timedelta(seconds=random.randint(1, interval_minutes * 60))
+        logger.info(f"Adding job: {job_id} with interval {interval_minutes}m (first run {start_date:%H:%M:%S})")
         self.scheduler.add_job(
             func,
-            trigger=IntervalTrigger(minutes=interval_minutes),
+            trigger=IntervalTrigger(minutes=interval_minutes, start_date=start_date, jitter=JOB_JITTER_SECONDS),
             id=job_id,
             replace_existing=True,
             **kwargs
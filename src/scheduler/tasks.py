@@ -32,7 +32,7 @@ def run_enrichment():
     
     # 2. Size Verification (Step 5)
     size_enricher = SizeVerificationEnricher()
-    size_enricher.run(force=False)
+    asyncio.run(size_enricher.run(force=False))
     
     # 3. People Discovery
     discoverer = PeopleDiscoverer()
@@ -78,12 +78,25 @@ def run_compliance_sync():
 # STEP 15: CONTINUOUS EXPANSION & REFINEMENT TASKS
 # ===================================================================
 
+_outcome_tracker = None
+
+def _get_outcome_tracker():
+    """
+    One OutcomeTracker for the scheduler's lifetime, shared by outcome tracking
+    and scoring refinement, so an unchanged report is reused across jobs.
+    """
+    global _outcome_tracker
+    if _outcome_tracker is None:
+        from src.feedback.outcome_tracker import OutcomeTracker
+        _outcome_tracker = OutcomeTracker()
+    return _outcome_tracker
+
+
 def run_outcome_tracking():
     """Task to analyze outreach outcomes and log performance metrics."""
     logger.info(f"[{datetime.now()}] Starting outcome tracking...")
     try:
-        from src.feedback.outcome_tracker import OutcomeTracker
-        tracker = OutcomeTracker()
+        tracker = _get_outcome_tracker()
         report = tracker.log_report()
         logger.success(f"Outcome tracking complete. Global reply rate: {report['global_stats']['reply_rate_pct']}%")
     except Exception as e:
@@ -95,7 +108,7 @@ def run_scoring_refinement():
     logger.info(f"[{datetime.now()}] Starting scoring refinement...")
     try:
         from src.feedback.scoring_refiner import ScoringRefiner
-        refiner = ScoringRefiner()
+        refiner = ScoringRefiner(tracker=_get_outcome_tracker())
         summary = refiner.refine(dry_run=False)
         logger.success(
             f"Scoring refinement complete. "
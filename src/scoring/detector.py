@@ -1,6 +1,9 @@
 import json
+import os
 import re
 import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from loguru import logger
@@ -9,6 +12,27 @@ from sqlmodel import select, Session
 from src.storage.models import Company, Signal, CompanySignalLink
 from src.storage.db import get_session
 
+# Keep IN (...) lists well below SQLite's bound-parameter limit
+LINK_BATCH_SIZE = 500
+
+# Batches at least this large are scored across worker processes. Starting a
+# spawned worker measured ~0.55s, about 6 serial scorings of a 40KB page, so a
+# 2-worker pool only breaks even around 13 texts; below this, score inline.
+PARALLEL_SCORING_MIN_BATCH = 24
+
+# Detector shipped to each scoring worker once, by the pool initializer
+_worker_detector: Optional["AgentSignalDetector"] = None
+
+
+def _init_scoring_worker(detector: "AgentSignalDetector"):
+    global _worker_detector
+    _worker_detector = detector
+
+
+def _analyze_in_worker(text: str) -> Dict[str, Any]:
+    return _worker_detector.analyze_text(text)
+
+
 class AgentSignalDetector:
     """
     Unified ICP Scoring Model.
@@ -23,6 +47,19 @@ class AgentSignalDetector:
     def __init__(self, config_path: str = "scoring_config.json"):
         with open(config_path, "r") as f:
             self.config = json.load(f)
+
+        # Keyword patterns compiled once per detector rather than per company:
+        # [(category, [(signal_key, details, [(keyword, pattern), ...]), ...]), ...]
+        self._signal_patterns = [
+            (category, [
+                (signal_key, details, [
+                    (kw, re.compile(rf"\b{re.escape(kw.lower())}\b"))
+                    for kw in details.get("keywords", [])
+                ])
+                for signal_key, details in signals.items()
+            ])
+            for category, signals in self.config.get("signals", {}).items()
+        ]
             
     def analyze_text(self, text: str) -> Dict[str, Any]:
         """
@@ -42,18 +79,16 @@ class AgentSignalDetector:
         total_score = 0
         reasoning = []
         
-        for category, signals in self.config.get("signals", {}).items():
+        for category, signals in self._signal_patterns:
             category_score = 0
             category_signals = []
             
-            for signal_key, details in signals.items():
-                keywords = details.get("keywords", [])
+            for signal_key, details, patterns in signals:
                 matches = []
                 count = 0
                 
-                for kw in keywords:
-                    pattern = rf"\b{re.escape(kw.lower())}\b"
-                    found = re.findall(pattern, text_lower)
+                for kw, pattern in patterns:
+                    found = pattern.findall(text_lower)
                     if found:
                         matches.append(kw)
                         count += len(found)
@@ -65,7 +100,7 @@ class AgentSignalDetector:
                     signal_data = {
                         "intensity": round(intensity, 2),
                         "count": count,
-                        "matches": list(set(matches)),
+                        "matches": list(dict.fromkeys(matches)),
                         "category": category,
                         "description": details.get("description"),
                         "points": base_points
@@ -135,58 +170,106 @@ class AgentSignalDetector:
             "reasoning": reasoning
         }
 
+    def analyze_many(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        analyze_text over many texts. Scoring is pure CPU work on independent
+        inputs, so larger batches fan out over a process pool (regex matching
+        holds the GIL, which rules out threads).
+        """
+        workers = min(os.cpu_count() or 1, len(texts))
+        if len(texts) < PARALLEL_SCORING_MIN_BATCH or workers < 2:
+            return [self.analyze_text(text) for text in texts]
+
+        try:
+            # Spawned, not forked: callers run on scheduler threads holding live
+            # SQLite connections, which a forked child must not inherit
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_scoring_worker,
+                initargs=(self,),
+            ) as executor:
+                chunksize = max(1, len(texts) // (workers * 4))
+                return list(executor.map(_analyze_in_worker, texts, chunksize=chunksize))
+        except Exception as e:
+            logger.warning(f"Parallel scoring unavailable ({e}); scoring serially.")
+            return [self.analyze_text(text) for text in texts]
+
+    def _load_links(self, session: Session, companies: List[Company]) -> Dict[tuple, CompanySignalLink]:
+        """Existing signal links for the given companies, keyed by (company_id, signal_id)."""
+        company_ids = [company.id for company in companies]
+        links = {}
+        for start in range(0, len(company_ids), LINK_BATCH_SIZE):
+            batch = company_ids[start:start + LINK_BATCH_SIZE]
+            for link in session.exec(
+                select(CompanySignalLink).where(CompanySignalLink.company_id.in_(batch))
+            ).all():
+                links[(link.company_id, link.signal_id)] = link
+        return links
+
     def process_company(self, session: Session, company: Company):
         """Processes a company and stores unified score + reasoning signals."""
-        if not company.website_content:
-            logger.warning(f"No content for {company.domain}, disqualifying.")
-            company.fitness_score = 0
-            company.fitness_level = "disqualified"
-            company.is_scored = True
-            session.add(company)
-            return
+        self.process_batch(session, [company])
+
+    def process_batch(self, session: Session, companies: List[Company]):
+        """
+        Scores a batch of companies. Signal ids and existing links are loaded
+        once for the whole batch instead of two lookups per detected signal.
+        """
+        signal_ids = dict(session.exec(select(Signal.name, Signal.id)).all())
+        links = self._load_links(session, companies)
+
+        for company in companies:
+            if not company.website_content:
+                logger.warning(f"No content for {company.domain}, disqualifying.")
+                company.fitness_score = 0
+                company.fitness_level = "disqualified"
+                company.is_scored = True
+                session.add(company)
+
+        # Score first (possibly in parallel), then apply results in this thread
+        scorable = [company for company in companies if company.website_content]
+        analyses = self.analyze_many([company.website_content for company in scorable])
+
+        for company, analysis in zip(scorable, analyses):
             
-        analysis = self.analyze_text(company.website_content)
-        
-        company.fitness_score = analysis["total_score"]
-        company.fitness_level = analysis["tier"]
-        company.agent_maturity_level = analysis["maturity_level"]
-        
-        # Store detailed reasoning for outreach
-        metadata = {
-            "last_scored": datetime.utcnow().isoformat(),
-            "score_breakdown": analysis["signals"],
-            "reasoning_summary": analysis["reasoning"]
-        }
-        company.signal_metadata = json.dumps(metadata)
-        
-        # Update Signal objects and Link table
-        for signal_key, data in analysis["signals"].items():
-            statement = select(Signal).where(Signal.name == signal_key)
-            signal_obj = session.exec(statement).first()
+            company.fitness_score = analysis["total_score"]
+            company.fitness_level = analysis["tier"]
+            company.agent_maturity_level = analysis["maturity_level"]
             
-            if signal_obj:
-                link_statement = select(CompanySignalLink).where(
-                    CompanySignalLink.company_id == company.id,
-                    CompanySignalLink.signal_id == signal_obj.id
-                )
-                link = session.exec(link_statement).first()
-                
+            # Store detailed reasoning for outreach
+            scored_at = datetime.utcnow()
+            company.last_scored_at = scored_at
+            metadata = {
+                "last_scored": scored_at.isoformat(),
+                "score_breakdown": analysis["signals"],
+                "reasoning_summary": analysis["reasoning"]
+            }
+            company.signal_metadata = json.dumps(metadata)
+            
+            # Update Signal objects and Link table
+            for signal_key, data in analysis["signals"].items():
+                signal_id = signal_ids.get(signal_key)
+                if signal_id is None:
+                    continue
+
+                link = links.get((company.id, signal_id))
                 if not link:
                     link = CompanySignalLink(
                         company_id=company.id,
-                        signal_id=signal_obj.id,
+                        signal_id=signal_id,
                         intensity=data["intensity"],
                         occurrences=data["count"]
                     )
-                    session.add(link)
+                    links[(company.id, signal_id)] = link
                 else:
                     link.intensity = data["intensity"]
                     link.occurrences = data["count"]
-                    session.add(link)
-                    
-        company.is_scored = True
-        session.add(company)
-        logger.info(f"Qualified {company.domain}: Tier={company.fitness_level}, Score={company.fitness_score}")
+                session.add(link)
+                        
+            company.is_scored = True
+            session.add(company)
+            logger.info(f"Qualified {company.domain}: Tier={company.fitness_level}, Score={company.fitness_score}")
 
     def run(self):
         """Processes all scraped but unscored companies."""
@@ -201,8 +284,7 @@ class AgentSignalDetector:
                 return
                 
             logger.info(f"Found {len(companies)} companies to score.")
-            for company in companies:
-                self.process_company(session, company)
+            self.process_batch(session, companies)
             
             session.commit()
 
@@ -1,10 +1,82 @@
 import os
+import sqlite3
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
 from sqlmodel import SQLModel, create_engine, Session, select
 from loguru import logger
 from .models import Signal, Company, Contact, Outreach, Reply, TaskLog, SuppressionList
 
 DB_FILE = "data/prospects.db"
-engine = create_engine(f"sqlite:///{DB_FILE}", echo=False)
+
+# Applied to every new SQLite connection. WAL lets the scheduler tasks and the
+# inspection scripts read while another task is writing.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=30000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Read-only connections cannot switch the journal mode (WAL is persisted by
+# the writers) and must never take the write lock.
+SQLITE_READONLY_PRAGMAS = tuple(
+    pragma for pragma in SQLITE_PRAGMAS if not pragma.startswith("PRAGMA journal_mode")
+) + ("PRAGMA query_only=1",)
+
+# Per-connection prepared statement cache (sqlite3 default is 128). Sized for
+# the long-lived pooled connections that run many distinct statements.
+SQLITE_CACHED_STATEMENTS = 512
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas=SQLITE_PRAGMAS):
+    """Apply the shared SQLite tuning PRAGMAs to a raw DB-API connection."""
+    cursor = dbapi_connection.cursor()
+    for pragma in pragmas:
+        cursor.execute(pragma)
+    cursor.close()
+
+def connect_sqlite(db_path: str = DB_FILE, read_only: bool = False) -> sqlite3.Connection:
+    """Open a plain sqlite3 connection with the shared PRAGMAs applied."""
+    if read_only:
+        conn = sqlite3.connect(
+            f"file:{db_path}?mode=ro", uri=True, timeout=30, cached_statements=SQLITE_CACHED_STATEMENTS
+        )
+        apply_sqlite_pragmas(conn, SQLITE_READONLY_PRAGMAS)
+    else:
+        conn = sqlite3.connect(db_path, timeout=30, cached_statements=SQLITE_CACHED_STATEMENTS)
+        apply_sqlite_pragmas(conn)
+    return conn
+
+# Pooled connections are reused across sessions (and scheduler threads), so
+# PRAGMA setup and file opens happen once per connection, not per session.
+# One steady writer connection; reads get their own pool on readonly_engine.
+engine = create_engine(
+    f"sqlite:///{DB_FILE}",
+    echo=False,
+    poolclass=QueuePool,
+    pool_size=1,
+    max_overflow=4,
+    connect_args={"check_same_thread": False, "timeout": 30, "cached_statements": SQLITE_CACHED_STATEMENTS},
+)
+
+# Separate engine for pure readers (inspection scripts, reports)
+readonly_engine = create_engine(
+    f"sqlite:///file:{DB_FILE}?mode=ro&uri=true",
+    echo=False,
+    poolclass=QueuePool,
+    pool_size=4,
+    max_overflow=4,
+    connect_args={"check_same_thread": False, "timeout": 30, "cached_statements": SQLITE_CACHED_STATEMENTS},
+)
+
+@event.listens_for(engine, "connect")
+def _on_connect(dbapi_connection, connection_record):
+    apply_sqlite_pragmas(dbapi_connection)
+
+@event.listens_for(readonly_engine, "connect")
+def _on_readonly_connect(dbapi_connection, connection_record):
+    apply_sqlite_pragmas(dbapi_connection, SQLITE_READONLY_PRAGMAS)
 
 def init_db():
     """Initialize the database and create tables."""
@@ -12,9 +84,13 @@ def init_db():
     SQLModel.metadata.create_all(engine)
     logger.success("Database initialized.")
 
-def get_session():
+def get_session(expire_on_commit: bool = True):
     """Get a new database session."""
-    return Session(engine)
+    return Session(engine, expire_on_commit=expire_on_commit)
+
+def get_readonly_session():
+    """Get a session that can only read (mode=ro, query_only)."""
+    return Session(readonly_engine)
 
 def seed_signals(scoring_config: dict):
     """Seed signals from the scoring configuration."""
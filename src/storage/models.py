@@ -1,14 +1,20 @@
 from datetime import datetime
 from typing import List, Optional
-from sqlmodel import Field, Relationship, SQLModel, create_engine, Session
+from sqlmodel import Field, Index, Relationship, SQLModel, create_engine, Session, text
 
 class CompanySignalLink(SQLModel, table=True):
+    # The primary key serves company -> signal lookups; this one serves signal -> company joins
+    __table_args__ = (Index("ix_companysignallink_signal_company", "signal_id", "company_id"),)
+
     company_id: Optional[int] = Field(default=None, foreign_key="company.id", primary_key=True)
     signal_id: Optional[int] = Field(default=None, foreign_key="signal.id", primary_key=True)
     intensity: float = Field(default=0.0)
     occurrences: int = Field(default=0)
 
 class Company(SQLModel, table=True):
+    # Partial index driving email generation's high_fit join
+    __table_args__ = (Index("ix_company_high_fit", "id", sqlite_where=text("fitness_level = 'high_fit'")),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     domain: str = Field(index=True, unique=True)
     name: Optional[str] = None
@@ -21,9 +27,10 @@ class Company(SQLModel, table=True):
     is_scraped: bool = Field(default=False)
     is_scored: bool = Field(default=False)
     fitness_score: int = Field(default=0)
-    fitness_level: Optional[str] = None # high_fit, medium_fit, low_fit
+    fitness_level: Optional[str] = Field(default=None, index=True) # high_fit, medium_fit, low_fit
     agent_maturity_level: Optional[str] = None # experimenting, production_ready, unknown
     signal_metadata: Optional[str] = None # JSON string for detailed signal info
+    last_scored_at: Optional[datetime] = Field(default=None, index=True) # mirrors signal_metadata["last_scored"]
     
     # Relationships
     contacts: List["Contact"] = Relationship(back_populates="company")
@@ -35,14 +42,17 @@ class Company(SQLModel, table=True):
     tasks: List["TaskLog"] = Relationship(back_populates="company")
 
 class Contact(SQLModel, table=True):
+    # Partial index over contacts still waiting for an email address
+    __table_args__ = (Index("ix_contact_needs_email", "company_id", sqlite_where=text("email IS NULL")),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    company_id: int = Field(foreign_key="company.id")
+    company_id: int = Field(foreign_key="company.id", index=True)
     name: str
     title: Optional[str] = None
     email: Optional[str] = Field(default=None, index=True)
     linkedin_url: Optional[str] = None
     is_verified: bool = Field(default=False)
-    outreach_status: str = Field(default="pending") # pending, active, completed, replied, bounced
+    outreach_status: str = Field(default="pending", index=True) # pending, active, completed, replied, bounced
     outreach_stage: int = Field(default=0)
     last_outreach_sent_at: Optional[datetime] = None
     relevance_score: int = Field(default=0)
@@ -70,18 +80,28 @@ class TaskLog(SQLModel, table=True):
     company: Optional[Company] = Relationship(back_populates="tasks")
 
 class Outreach(SQLModel, table=True):
+    # Covers the per-status, per-contact outreach counts in the feedback reports
+    __table_args__ = (Index("ix_outreach_status_contact", "status", "contact_id"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    contact_id: int = Field(foreign_key="contact.id")
+    contact_id: int = Field(foreign_key="contact.id", index=True)
     template_id: str
     stage: int = Field(default=1)
     sent_at: Optional[datetime] = None
     reply_received_at: Optional[datetime] = None
-    status: str = Field(default="draft") # draft, queued, sent, failed, opened, clicked, replied
+    status: str = Field(default="draft", index=True) # draft, queued, sent, failed, opened, clicked, replied
     content: Optional[str] = None
 
 class Reply(SQLModel, table=True):
+    # Covers classification filters/counts joined back to contacts. AUTOINCREMENT keeps
+    # SQLite from reusing a deleted max id, which the outcome tracker's reply watermark relies on
+    __table_args__ = (
+        Index("ix_reply_classification_contact", "classification", "contact_id"),
+        {"sqlite_autoincrement": True},
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    contact_id: int = Field(foreign_key="contact.id")
+    contact_id: int = Field(foreign_key="contact.id", index=True)
     content: str
     classification: str # interest, deferral, irrelevance, referral, opt_out, unknown
     received_at: datetime = Field(default_factory=datetime.utcnow)
@@ -91,6 +111,9 @@ class Reply(SQLModel, table=True):
     contact: Contact = Relationship(back_populates="replies")
 
 class SuppressionList(SQLModel, table=True):
+    # Lookups always filter on (type, value)
+    __table_args__ = (Index("ix_suppression_type_value", "type", "value"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     type: str # "email" or "domain"
     value: str = Field(index=True, unique=True)
@@ -0,0 +1,59 @@
+import unittest
+from sqlmodel import SQLModel, Session, create_engine, select
+from src.storage.models import Company, Contact, Outreach, Reply, SuppressionList
+from src.compliance.data_protection import DataProtectionManager
+
+class TestDataProtection(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        SQLModel.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        self.manager = DataProtectionManager()
+
+        company = Company(domain="acme.io", name="Acme")
+        self.session.add(company)
+        self.session.commit()
+        for name, email in [("Jane Doe", "jane@acme.io"), ("John Roe", "john@acme.io")]:
+            contact = Contact(company_id=company.id, name=name, email=email)
+            self.session.add(contact)
+            self.session.commit()
+            self.session.add(Outreach(contact_id=contact.id, template_id="t1", status="sent"))
+            self.session.add(Outreach(contact_id=contact.id, template_id="t2", status="draft"))
+            self.session.add(Reply(contact_id=contact.id, content="Thanks", classification="interest"))
+        self.session.commit()
+
+    def tearDown(self):
+        self.session.close()
+
+    def test_delete_contact_data(self):
+        result = self.manager.delete_contact_data(self.session, "Jane@Acme.io")
+        self.session.commit()
+
+        self.assertTrue(result["contact_deleted"])
+        self.assertEqual(result["outreach_records_deleted"], 2)
+        self.assertEqual(result["replies_deleted"], 1)
+        self.assertEqual(len(self.session.exec(select(Contact)).all()), 1)
+        self.assertEqual(len(self.session.exec(select(Outreach)).all()), 2)
+
+    def test_delete_company_data(self):
+        result = self.manager.delete_company_data(self.session, "ACME.io")
+        self.session.commit()
+
+        self.assertTrue(result["company_deleted"])
+        self.assertEqual(result["contacts_deleted"], 2)
+        self.assertEqual(result["outreach_records_deleted"], 4)
+        self.assertEqual(result["replies_deleted"], 2)
+        self.assertEqual(self.session.exec(select(Company)).all(), [])
+        self.assertEqual(self.session.exec(select(Reply)).all(), [])
+
+        suppressed = {entry.value for entry in self.session.exec(select(SuppressionList)).all()}
+        self.assertEqual(suppressed, {"acme.io", "jane@acme.io", "john@acme.io"})
+
+    def test_audit_data_sources_counts(self):
+        audit = self.manager.audit_data_sources(self.session)
+
+        self.assertEqual(audit["total_companies"], 1)
+        self.assertEqual(audit["total_contacts"], 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+import os
+import json
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+from sqlmodel import SQLModel, Session, create_engine
+from src.storage.models import Company, Contact, Outreach, Reply, Signal, CompanySignalLink
+from src.feedback.outcome_tracker import OutcomeTracker
+
+class TestOutcomeTracker(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        SQLModel.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        self.tracker = OutcomeTracker()
+
+        signal = Signal(name="uses_agents", category="AI_AGENT_MATURITY", points=10)
+        acme = Company(domain="acme.io", fitness_level="high_priority")
+        empty = Company(domain="empty.io", fitness_level="high_priority")
+        other = Company(domain="other.io", fitness_level="disqualified")
+        self.session.add_all([signal, acme, empty, other])
+        self.session.flush()
+        self.session.add_all([
+            CompanySignalLink(company_id=acme.id, signal_id=signal.id),
+            CompanySignalLink(company_id=empty.id, signal_id=signal.id),
+        ])
+
+        jane = Contact(company_id=acme.id, name="Jane")
+        john = Contact(company_id=acme.id, name="John")
+        bob = Contact(company_id=other.id, name="Bob")
+        self.session.add_all([jane, john, bob])
+        self.session.flush()
+
+        # Two sends and two replies for Jane must not multiply into four of each
+        self.session.add_all([
+            Outreach(contact_id=jane.id, template_id="t1", status="sent"),
+            Outreach(contact_id=jane.id, template_id="t2", status="sent"),
+            Outreach(contact_id=john.id, template_id="t1", status="sent"),
+            Outreach(contact_id=john.id, template_id="t2", status="draft"),
+            Outreach(contact_id=bob.id, template_id="t1", status="sent"),
+            Reply(contact_id=jane.id, content="yes", classification="interest"),
+            Reply(contact_id=jane.id, content="stop", classification="opt_out"),
+        ])
+        self.session.commit()
+
+    def tearDown(self):
+        self.session.close()
+
+    def test_tier_performance_counts_each_row_once(self):
+        tiers = self.tracker._get_tier_performance(self.session)
+
+        self.assertEqual(tiers["high_priority"], {
+            "companies": 2, "contacts": 2, "sent": 3,
+            "replied": 2, "interest": 1, "reply_rate_pct": 66.67,
+        })
+        self.assertEqual(tiers["disqualified"]["sent"], 1)
+        self.assertEqual(tiers["medium_priority"]["companies"], 0)
+
+    def test_signal_performance_counts_each_row_once(self):
+        perf = self.tracker._get_signal_performance(self.session)["uses_agents"]
+
+        self.assertEqual(perf["companies_with_signal"], 2)
+        self.assertEqual(perf["contacts_reached"], 2)
+        self.assertEqual(perf["emails_sent"], 3)
+        self.assertEqual(perf["replies"], 2)
+        self.assertEqual(perf["interests"], 1)
+        self.assertEqual(perf["opt_outs"], 1)
+
+class TestReportFingerprint(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        SQLModel.metadata.create_all(self.engine)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.tracker = OutcomeTracker(state_path=os.path.join(self.tmp_dir.name, "feedback_state.json"))
+        patcher = mock.patch(
+            "src.feedback.outcome_tracker.get_session", lambda: Session(self.engine)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        with Session(self.engine) as session:
+            session.add(Company(domain="acme.io", fitness_level="medium_priority"))
+            session.commit()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_unchanged_data_reuses_the_report(self):
+        report = self.tracker.generate_report()
+        self.assertIs(self.tracker.generate_report(), report)
+
+    def test_rescoring_invalidates_the_report(self):
+        report = self.tracker.generate_report()
+        self.assertEqual(report["tier_performance"]["medium_priority"]["companies"], 1)
+
+        with Session(self.engine) as session:
+            company = session.get(Company, 1)
+            company.fitness_level = "high_priority"
+            company.last_scored_at = datetime.utcnow()
+            session.add(company)
+            session.commit()
+
+        tiers = self.tracker.generate_report()["tier_performance"]
+        self.assertEqual(tiers["medium_priority"]["companies"], 0)
+        self.assertEqual(tiers["high_priority"]["companies"], 1)
+
+class TestReplyClassificationCounts(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        SQLModel.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.state_path = os.path.join(self.tmp_dir.name, "feedback_state.json")
+        self.tracker = OutcomeTracker(state_path=self.state_path)
+
+        company = Company(domain="acme.io")
+        self.session.add(company)
+        self.session.flush()
+        self.contact = Contact(company_id=company.id, name="Jane")
+        self.session.add(self.contact)
+        self.session.commit()
+
+    def tearDown(self):
+        self.session.close()
+        self.tmp_dir.cleanup()
+
+    def _add_reply(self, classification: str) -> Reply:
+        reply = Reply(contact_id=self.contact.id, content="...", classification=classification)
+        self.session.add(reply)
+        self.session.commit()
+        return reply
+
+    def _delete_reply(self, reply: Reply):
+        self.session.delete(reply)
+        self.session.commit()
+
+    def test_new_replies_are_added_past_the_watermark(self):
+        self._add_reply("interest")
+        self.assertEqual(self.tracker._get_reply_classification_counts(self.session), {"interest": 1})
+
+        latest = self._add_reply("opt_out")
+        counts = self.tracker._get_reply_classification_counts(self.session)
+
+        self.assertEqual(counts, {"interest": 1, "opt_out": 1})
+        with open(self.state_path) as f:
+            state = json.load(f)
+        self.assertEqual(state["last_reply_id"], latest.id)
+        self.assertEqual(state["reply_rows"], 2)
+
+    def test_deleted_reply_triggers_a_recount(self):
+        first = self._add_reply("interest")
+        self._add_reply("interest")
+        self.tracker._get_reply_classification_counts(self.session)
+
+        self._delete_reply(first)
+        self._add_reply("opt_out")
+
+        self.assertEqual(
+            self.tracker._get_reply_classification_counts(self.session),
+            {"interest": 1, "opt_out": 1},
+        )
+
+    def test_deleted_max_id_is_not_reused(self):
+        self._add_reply("interest")
+        latest = self._add_reply("interest")
+        self.tracker._get_reply_classification_counts(self.session)
+
+        deleted_id = latest.id
+        self._delete_reply(latest)
+        replacement = self._add_reply("opt_out")
+
+        self.assertNotEqual(replacement.id, deleted_id)
+        self.assertEqual(
+            self.tracker._get_reply_classification_counts(self.session),
+            {"interest": 1, "opt_out": 1},
+        )
+
+    def test_state_from_an_older_version_is_rebuilt(self):
+        self._add_reply("interest")
+        self._add_reply("opt_out")
+        with open(self.state_path, "w") as f:
+            json.dump({"last_reply_id": 2, "reply_rows": 2, "reply_counts": {"interest": 2}}, f)
+
+        self.assertEqual(
+            self.tracker._get_reply_classification_counts(self.session),
+            {"interest": 1, "opt_out": 1},
+        )
+
+if __name__ == "__main__":
+    unittest.main()
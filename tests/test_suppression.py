@@ -0,0 +1,117 @@
+import unittest
+from sqlmodel import SQLModel, Session, create_engine, select
+from src.storage.models import Company, Contact, SuppressionList
+from src.compliance.suppression import SuppressionManager
+from src.compliance.bloom import BloomFilter
+
+class TestSuppression(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        SQLModel.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        self.manager = SuppressionManager()
+
+    def tearDown(self):
+        self.session.close()
+
+    def test_bulk_suppress_emails_skips_existing(self):
+        self.manager.suppress_email(self.session, "jane@acme.io", reason="opt_out")
+
+        added = self.manager.bulk_suppress_emails(
+            self.session, ["Jane@Acme.io", "john@acme.io", "john@acme.io", None], reason="bounced"
+        )
+        self.session.commit()
+
+        self.assertEqual(added, 1)
+        entries = {e.value: e.reason for e in self.session.exec(select(SuppressionList)).all()}
+        self.assertEqual(entries, {"jane@acme.io": "opt_out", "john@acme.io": "bounced"})
+        self.assertTrue(self.manager.is_suppressed(self.session, "john@acme.io"))
+
+    def test_is_suppressed_sees_entries_added_after_filter_built(self):
+        self.assertFalse(self.manager.is_suppressed(self.session, "jane@acme.io"))
+
+        self.manager.suppress_domain(self.session, "acme.io", reason="manual")
+        self.manager.suppress_email(self.session, "bob@other.io", reason="opt_out")
+
+        self.assertTrue(self.manager.is_suppressed(self.session, "Jane@ACME.io"))
+        self.assertTrue(self.manager.is_suppressed(self.session, "bob@other.io"))
+        self.assertFalse(self.manager.is_suppressed(self.session, "alice@other.io"))
+
+    def test_unsuppressed_entry_is_not_reported(self):
+        self.manager.suppress_email(self.session, "jane@acme.io")
+        self.assertTrue(self.manager.is_suppressed(self.session, "jane@acme.io"))
+
+        self.manager.unsuppress_email(self.session, "jane@acme.io")
+        self.assertFalse(self.manager.is_suppressed(self.session, "jane@acme.io"))
+
+    def test_sync_from_contacts(self):
+        company = Company(domain="acme.io")
+        self.session.add(company)
+        self.session.commit()
+        for name, email, status in [
+            ("Jane Doe", " Jane@Acme.io", "opt_out"),
+            ("Jane Dup", "jane@acme.io", "bounced"),
+            ("John Roe", "john@acme.io", "bounced"),
+            ("Ann Lee", "ann@acme.io", "active"),
+            ("No Email", None, "opt_out"),
+            ("Old Entry", "old@acme.io", "bounced"),
+        ]:
+            self.session.add(Contact(company_id=company.id, name=name, email=email, outreach_status=status))
+        self.session.commit()
+        self.manager.suppress_email(self.session, "old@acme.io", reason="manual")
+        self.assertFalse(self.manager.is_suppressed(self.session, "john@acme.io"))
+
+        count = self.manager.sync_from_contacts(self.session)
+        self.session.commit()
+
+        self.assertEqual(count, 2)
+        entries = {e.value: e.reason for e in self.session.exec(select(SuppressionList)).all()}
+        self.assertEqual(entries, {"jane@acme.io": "opt_out", "john@acme.io": "bounced", "old@acme.io": "manual"})
+        self.assertTrue(self.manager.is_suppressed(self.session, "john@acme.io"))
+        self.assertEqual(self.manager.sync_from_contacts(self.session), 0)
+
+    def test_negative_cache_is_cleared_by_new_suppressions(self):
+        self.assertFalse(self.manager.is_suppressed(self.session, "jane@acme.io"))
+
+        self.manager.suppress_domain(self.session, "acme.io", reason="manual")
+        self.session.commit()
+
+        self.assertTrue(self.manager.is_suppressed(self.session, "jane@acme.io"))
+
+    def test_filter_suppressed_matches_emails_and_domains(self):
+        self.manager.suppress_email(self.session, "jane@acme.io", reason="opt_out")
+        self.manager.suppress_domain(self.session, "spam.io", reason="manual")
+        self.session.commit()
+
+        suppressed = self.manager.filter_suppressed(
+            self.session, ["Jane@Acme.io", "john@acme.io", "bob@spam.io", "not-an-email"]
+        )
+
+        self.assertEqual(suppressed, {"Jane@Acme.io", "bob@spam.io"})
+
+    def test_get_suppression_stats(self):
+        self.manager.suppress_email(self.session, "jane@acme.io", reason="opt_out")
+        self.manager.suppress_email(self.session, "john@acme.io", reason="opt_out")
+        self.manager.suppress_domain(self.session, "spam.io", reason="manual")
+        self.session.add(SuppressionList(type="email", value="ann@acme.io", reason=None))
+        self.session.commit()
+
+        stats = self.manager.get_suppression_stats(self.session)
+
+        self.assertEqual(stats["total"], 4)
+        self.assertEqual(stats["by_type"], {"email": 3, "domain": 1})
+        self.assertEqual(stats["by_reason"], {"opt_out": 2, "manual": 1, "unknown": 1})
+
+class TestBloomFilter(unittest.TestCase):
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(capacity=500)
+        keys = [f"e:user{i}@example.com" for i in range(500)]
+        for key in keys:
+            bloom.add(key)
+
+        self.assertTrue(all(key in bloom for key in keys))
+        false_positives = sum(f"e:other{i}@example.com" in bloom for i in range(1000))
+        self.assertLess(false_positives, 5)
+
+if __name__ == "__main__":
+    unittest.main()